@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: str-based vs bytes-based decoding of captured get_pc bodies
+
+Each body is wrapped the way Network.getResponseBody returns it (base64),
+then pushed through decode -> archive digest -> json.loads. Reports time per
+body and peak traced allocation for the old and new paths.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import time
+import tracemalloc
+
+from corpus import load_bodies
+
+from shopee_core.body_codec import as_bytes, decode_response_body
+
+
+def old_path(result):
+    body = result.get("body", "")
+    if result.get("base64Encoded", False):
+        body = base64.b64decode(body).decode("utf-8")
+    hashlib.blake2b(body.encode('utf-8'), digest_size=20).digest()
+    return json.loads(body)
+
+
+def new_path(result):
+    body = decode_response_body(result)
+    hashlib.blake2b(as_bytes(body), digest_size=20).digest()
+    return json.loads(body)
+
+
+def measure(path, results, repeat):
+    # Peak allocation of a single pass
+    tracemalloc.start()
+    for result in results:
+        path(result)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for result in results:
+            path(result)
+    elapsed = (time.perf_counter() - start) / (repeat * len(results))
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--corpus-dir', help="directory of recorded bodies (one file per body)")
+    parser.add_argument('--bodies', type=int, default=200, help="synthetic bodies when no corpus is given")
+    parser.add_argument('--description-size', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    results = [
+        {'body': base64.b64encode(body).decode('ascii'), 'base64Encoded': True}
+        for body in load_bodies(args.corpus_dir, args.bodies, args.description_size)
+    ]
+
+    timings = {}
+    for label, path in (('str', old_path), ('bytes', new_path)):
+        elapsed, peak = measure(path, results, args.repeat)
+        timings[label] = elapsed
+        print(f"{label:>6}: {elapsed * 1e6:>10.1f} us/body  peak {peak / 1024:>10.1f} KiB")
+    print(f"speedup: {timings['str'] / timings['bytes']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: original per-line extraction vs the current per-line path vs the streaming batch extractor
+"""
+
+import argparse
+import json
+import re
+import time
+from datetime import datetime
+from typing import List
+
+from corpus import iter_log_lines
+
+from shopee_core.processor import ShopeeDataProcessor
+
+
+def legacy_process_mobile_api_response(response_data: str) -> dict:
+    """The original extractor: greedy regex, json.loads and a `data.get('item', {})` per field"""
+    try:
+        json_match = re.search(r'\{.*\}', response_data)
+        if not json_match:
+            return {}
+
+        data = json.loads(json_match.group())
+        return {
+            'product_id': data.get('item', {}).get('itemid'),
+            'shop_id': data.get('item', {}).get('shopid'),
+            'name': data.get('item', {}).get('name'),
+            'price': data.get('item', {}).get('price'),
+            'stock': data.get('item', {}).get('stock'),
+            'rating': data.get('item', {}).get('item_rating', {}).get('rating_star'),
+            'sold_count': data.get('item', {}).get('sold'),
+            'description': data.get('item', {}).get('description'),
+            'images': [img.get('image') for img in data.get('item', {}).get('images', [])],
+            'extracted_at': datetime.now().isoformat()
+        }
+    except Exception as e:
+        print(f"Error processing API response: {e}")
+        return {}
+
+
+def bench_legacy(processor: ShopeeDataProcessor, lines: List[str]):
+    for line in lines:
+        legacy_process_mobile_api_response(line)
+
+
+def bench_per_line(processor: ShopeeDataProcessor, lines: List[str]):
+    for line in lines:
+        processor.process_mobile_api_response(line)
+
+
+def bench_streaming(processor: ShopeeDataProcessor, lines: List[str]):
+    for _ in processor.iter_mobile_api_responses(lines):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--records', type=int, default=5_000)
+    parser.add_argument('--description-size', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    processor = ShopeeDataProcessor()
+    # Generated up front so only extraction is timed
+    lines = list(iter_log_lines(args.records, args.description_size))
+    
+    legacy_rate = None
+    for label, bench in (('legacy', bench_legacy), ('per-line', bench_per_line), ('streaming', bench_streaming)):
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            bench(processor, lines)
+            best = min(best, time.perf_counter() - start)
+        rate = len(lines) / best
+        legacy_rate = legacy_rate or rate
+        print(f"{label:>10}: {rate:>12,.0f} records/sec  ({rate / legacy_rate:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: logcat capture loop throughput (lines/sec) on a recorded logcat file
+"""
+
+import argparse
+import os
+import queue
+import re
+import tempfile
+import time
+
+from corpus import write_logcat_file
+
+from mobile_emulation_template import NetworkTrafficCapture
+
+
+def legacy_capture(path: str) -> int:
+    """The original readline loop with per-line pattern list and re.search"""
+    capture_queue = queue.Queue()
+
+    def is_shopee_api_request(log_line):
+        api_patterns = [
+            r'shopee\.tw/api/v4/pdp/get_pc',
+            r'shopee\.tw/api/v4/item/get',
+            r'shopee\.tw/api/v4/product/get_shop_info'
+        ]
+        return any(re.search(pattern, log_line) for pattern in api_patterns)
+
+    lines = 0
+    with open(path, 'r', encoding='utf-8', buffering=1) as f:
+        for line in iter(f.readline, ''):
+            lines += 1
+            if is_shopee_api_request(line):
+                capture_queue.put({'log_line': line.strip()})
+    return lines
+
+
+def current_capture(path: str) -> int:
+    capture = NetworkTrafficCapture(max_queued=10_000_000)
+    capture.is_capturing = True
+    with open(path, 'r', encoding='utf-8', buffering=65536) as f:
+        return capture._process_log_stream(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--logcat-file', help="recorded `adb logcat -v time` output")
+    parser.add_argument('--lines', type=int, default=500_000, help="synthetic lines when no file is given")
+    parser.add_argument('--api-ratio', type=float, default=0.02)
+    args = parser.parse_args()
+
+    path = args.logcat_file
+    if not path:
+        fd, path = tempfile.mkstemp(suffix='.logcat')
+        os.close(fd)
+        write_logcat_file(path, args.lines, args.api_ratio)
+
+    try:
+        for label, bench in (('legacy', legacy_capture), ('current', current_capture)):
+            start = time.perf_counter()
+            lines = bench(path)
+            elapsed = time.perf_counter() - start
+            print(f"{label:>8}: {lines / elapsed:>14,.0f} lines/sec")
+    finally:
+        if not args.logcat_file:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
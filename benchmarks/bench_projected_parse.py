@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full json.loads vs field-projected parsing of get_pc bodies
+"""
+
+import argparse
+import time
+
+from corpus import load_bodies, make_pc_body
+
+from shopee_core.processor import ShopeeDataProcessor
+from shopee_core.projected_parser import DEFAULT_ITEM_FIELDS
+
+
+def run(processor: ShopeeDataProcessor, bodies, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for body in bodies:
+            processor.process_api_body(body)
+    return (time.perf_counter() - start) / (repeat * len(bodies))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--corpus-dir', help="directory of recorded get_pc bodies")
+    parser.add_argument('--bodies', type=int, default=200)
+    parser.add_argument('--description-size', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.corpus_dir:
+        bodies = load_bodies(args.corpus_dir, 0)
+    else:
+        bodies = [make_pc_body(seed, args.description_size).encode('utf-8') for seed in range(args.bodies)]
+
+    variants = (
+        ('full', ShopeeDataProcessor()),
+        ('projected', ShopeeDataProcessor(item_fields=DEFAULT_ITEM_FIELDS)),
+        ('projected+defer', ShopeeDataProcessor(compact_records=True, defer_description=True)),
+    )
+    baseline = None
+    for label, processor in variants:
+        elapsed = run(processor, bodies, args.repeat)
+        baseline = baseline or elapsed
+        print(f"{label:>16}: {elapsed * 1e6:>10.1f} us/body  ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
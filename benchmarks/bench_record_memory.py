@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory held by product dicts vs ProductRecord objects
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from corpus import make_item
+
+from shopee_core.processor import ShopeeDataProcessor
+
+
+def measure(processor: ShopeeDataProcessor, count: int, description_size: int) -> int:
+    """Traced bytes retained by `count` records, excluding the source items"""
+    gc.collect()
+    tracemalloc.start()
+    records = []
+    for seed in range(count):
+        item = make_item(seed, description_size)
+        records.append(processor._build_product_info({'item': item}))
+        del item
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--records', type=int, default=1_000_000)
+    parser.add_argument('--description-size', type=int, default=600)
+    args = parser.parse_args()
+
+    results = {}
+    for label, compact in (('dict', False), ('ProductRecord', True)):
+        retained = measure(ShopeeDataProcessor(compact_records=compact), args.records, args.description_size)
+        results[label] = retained
+        print(f"{label:>14}: {retained / 2**20:>10.1f} MiB  ({retained / args.records:,.0f} B/record)")
+    print(f"reduction: {results['dict'] / results['ProductRecord']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Synthetic and recorded corpora for the offline benchmarks
+"""
+
+import json
+import os
+import random
+import sys
+from typing import Iterator, List, Optional
+
+# Benchmarks run from a checkout, so make the template modules importable
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def make_item(seed: int, description_size: int = 2000) -> dict:
+    """Build a product item shaped like the get_pc `item` payload"""
+    rng = random.Random(seed)
+    return {
+        'itemid': 10_000_000 + seed,
+        'shopid': 500_000 + seed % 997,
+        'name': f"商品 {seed} - sample product name",
+        'price': rng.randint(100, 500_000) * 100_000,
+        'stock': rng.randint(0, 1000),
+        'sold': rng.randint(0, 50_000),
+        'item_rating': {
+            'rating_star': round(rng.uniform(1, 5), 2),
+            'rating_count': [rng.randint(0, 500) for _ in range(6)],
+        },
+        'description': ("描述 description line\n" * (description_size // 20 + 1))[:description_size],
+        'images': [{'image': f"{rng.getrandbits(128):032x}"} for _ in range(rng.randint(3, 9))],
+        'models': [
+            {'modelid': seed * 100 + i, 'name': f"variant {i}", 'price': rng.randint(1, 9) * 100_000,
+             'stock': rng.randint(0, 100), 'extinfo': {'tier_index': [i % 3, i // 3]}}
+            for i in range(rng.randint(1, 12))
+        ],
+        'tier_variations': [{'name': 'color', 'options': ['red', 'green', 'blue']}],
+        'attributes': [{'name': f"attr{i}", 'value': f"value{i}"} for i in range(8)],
+    }
+
+
+def make_body(seed: int, description_size: int = 2000) -> str:
+    """Build a recorded-style API body wrapping one item"""
+    return json.dumps({'error': None, 'item': make_item(seed, description_size)}, ensure_ascii=False)
+
+
+def make_log_line(seed: int, description_size: int = 2000) -> str:
+    """Build a logcat line carrying an API body"""
+    return (f"10-17 12:00:{seed % 60:02d}.000 I/chromium( 1234): "
+            f"https://shopee.tw/api/v4/pdp/get_pc {make_body(seed, description_size)}")
+
+
+def iter_log_lines(count: int, description_size: int = 2000) -> Iterator[str]:
+    """Yield synthetic logcat lines without holding them all in memory"""
+    for seed in range(count):
+        yield make_log_line(seed, description_size)
+
+
+def load_bodies(corpus_dir: Optional[str], count: int, description_size: int = 2000) -> List[bytes]:
+    """Load recorded bodies from a directory, or synthesize them"""
+    if corpus_dir:
+        bodies = []
+        for name in sorted(os.listdir(corpus_dir)):
+            with open(os.path.join(corpus_dir, name), 'rb') as f:
+                bodies.append(f.read())
+        return bodies
+    return [make_body(seed, description_size).encode('utf-8') for seed in range(count)]
+
+
+def write_logcat_file(path: str, count: int, api_ratio: float = 0.02, description_size: int = 200) -> str:
+    """Write a synthetic logcat recording where only `api_ratio` of lines hit the API"""
+    rng = random.Random(0)
+    with open(path, 'w', encoding='utf-8') as f:
+        for seed in range(count):
+            if rng.random() < api_ratio:
+                f.write(make_log_line(seed, description_size) + '\n')
+            else:
+                f.write(f"10-17 12:00:{seed % 60:02d}.000 V/chromium( 1234): [net] "
+                        f"https://cdn.example.com/static/{seed:08d}.js status=200 bytes={rng.randint(1, 99999)}\n")
+    return path
+
+
+def make_pc_body(seed: int, description_size: int = 2000, reviews: int = 40) -> str:
+    """Build a get_pc-style body: the item plus the sibling sections of a product page"""
+    rng = random.Random(seed)
+    data = {
+        'shop_detailed': {
+            'shopid': 500_000 + seed % 997,
+            'name': f"shop {seed % 997}",
+            'description': "shop description " * 50,
+            'vouchers': [{'promotionid': i, 'discount': rng.randint(1, 50), 'min_spend': 1000} for i in range(10)],
+        },
+        'product_review': {
+            'ratings': [
+                {'cmtid': seed * 1000 + i, 'rating_star': rng.randint(1, 5),
+                 'comment': "review text 評論 " * rng.randint(5, 40), 'images': [f"{rng.getrandbits(128):032x}"]}
+                for i in range(reviews)
+            ],
+        },
+        'item': make_item(seed, description_size),
+        'recommendations': [make_item(seed * 31 + i, 100) for i in range(6)],
+    }
+    return json.dumps({'error': 0, 'data': data}, ensure_ascii=False)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Offline Benchmark Suite for the Data Path
+
+Drives each stage from a corpus of recorded get_pc bodies and logcat lines,
+without a device or browser:
+
+    filter       NetworkTrafficCapture._is_shopee_api_request over logcat lines
+    mobile_parse ShopeeDataProcessor.process_mobile_api_response over API lines
+    pc_parse     cdp_template.process_product_data over get_pc bodies
+    sink_jsonl   JsonlSink writes of the parsed records
+    sink_gzip    GzipJsonlSink writes of the parsed records
+
+Reports throughput and peak traced memory per stage. A corpus directory
+holds `bodies/` (one recorded body per file) and `logcat.txt`; without one
+a synthetic corpus is generated.
+
+    python suite.py --output results.json
+    python suite.py --save-baseline baseline.json
+    python suite.py --baseline baseline.json --tolerance 0.15   # exits 1 on regression
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from corpus import load_bodies, make_pc_body, write_logcat_file
+
+import cdp_template
+from mobile_emulation_template import NetworkTrafficCapture
+from shopee_core.output_sinks import GzipJsonlSink, JsonlSink
+from shopee_core.processor import ShopeeDataProcessor
+
+
+class Corpus:
+    """Recorded (or synthetic) inputs shared by all stages"""
+
+    def __init__(self, corpus_dir: Optional[str], bodies: int, logcat_lines: int):
+        self._temp_dir = tempfile.mkdtemp(prefix="shopee_bench_")
+
+        if corpus_dir:
+            self.bodies = load_bodies(os.path.join(corpus_dir, "bodies"), 0)
+            logcat_path = os.path.join(corpus_dir, "logcat.txt")
+        else:
+            self.bodies = [make_pc_body(seed).encode('utf-8') for seed in range(bodies)]
+            logcat_path = write_logcat_file(os.path.join(self._temp_dir, "logcat.txt"), logcat_lines)
+
+        with open(logcat_path, 'r', encoding='utf-8', errors='replace') as f:
+            self.logcat_lines = f.readlines()
+
+        capture = NetworkTrafficCapture()
+        self.api_lines = [line for line in self.logcat_lines if capture._is_shopee_api_request(line)]
+
+        processor = ShopeeDataProcessor()
+        self.records = [processor.process_api_body(body) for body in self.bodies]
+
+    def output_dir(self, name: str) -> str:
+        path = os.path.join(self._temp_dir, name)
+        shutil.rmtree(path, ignore_errors=True)
+        return path
+
+    def cleanup(self):
+        shutil.rmtree(self._temp_dir, ignore_errors=True)
+
+
+def _stage_filter(corpus: Corpus) -> int:
+    is_api_request = NetworkTrafficCapture()._is_shopee_api_request
+    for line in corpus.logcat_lines:
+        is_api_request(line)
+    return len(corpus.logcat_lines)
+
+
+def _stage_mobile_parse(corpus: Corpus) -> int:
+    processor = ShopeeDataProcessor()
+    for line in corpus.api_lines:
+        processor.process_mobile_api_response(line)
+    return len(corpus.api_lines)
+
+
+def _stage_pc_parse(corpus: Corpus) -> int:
+    for body in corpus.bodies:
+        cdp_template.process_product_data(body, "https://shopee.tw/api/v4/pdp/get_pc")
+    return len(corpus.bodies)
+
+
+def _make_sink_stage(sink_class) -> Callable[[Corpus], int]:
+    def stage(corpus: Corpus) -> int:
+        with sink_class(corpus.output_dir(sink_class.__name__), batch_size=500) as sink:
+            sink.write_many(corpus.records)
+        return len(corpus.records)
+    return stage
+
+
+STAGES = {
+    'filter': _stage_filter,
+    'mobile_parse': _stage_mobile_parse,
+    'pc_parse': _stage_pc_parse,
+    'sink_jsonl': _make_sink_stage(JsonlSink),
+    'sink_gzip': _make_sink_stage(GzipJsonlSink),
+}
+
+
+def run_stage(stage: Callable[[Corpus], int], corpus: Corpus, repeat: int) -> Dict:
+    """Best-of-`repeat` throughput, then one traced pass for peak memory"""
+    best = float('inf')
+    items = 0
+    # Processing errors are printed by the code under test; keep them out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            items = stage(corpus)
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        stage(corpus)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        'items': items,
+        'seconds': round(best, 6),
+        'items_per_sec': round(items / best, 1) if best > 0 else 0.0,
+        'peak_bytes': peak,
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Return a message for every stage that regressed beyond `tolerance`"""
+    regressions = []
+    for name, current in results['stages'].items():
+        previous = baseline.get('stages', {}).get(name)
+        if not previous:
+            continue
+        if current['items_per_sec'] < previous['items_per_sec'] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {current['items_per_sec']:,.0f}/s vs baseline "
+                f"{previous['items_per_sec']:,.0f}/s"
+            )
+        if current['peak_bytes'] > previous['peak_bytes'] * (1 + tolerance):
+            regressions.append(
+                f"{name}: peak memory {current['peak_bytes'] / 1024:,.0f} KiB vs baseline "
+                f"{previous['peak_bytes'] / 1024:,.0f} KiB"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help="directory with bodies/ and logcat.txt")
+    parser.add_argument('--bodies', type=int, default=300, help="synthetic get_pc bodies")
+    parser.add_argument('--logcat-lines', type=int, default=200_000, help="synthetic logcat lines")
+    parser.add_argument('--stages', nargs='+', choices=sorted(STAGES), default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="write results JSON here")
+    parser.add_argument('--save-baseline', help="write results as the new baseline file")
+    parser.add_argument('--baseline', help="compare against this baseline file")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="allowed relative regression")
+    args = parser.parse_args(argv)
+
+    corpus = Corpus(args.corpus, args.bodies, args.logcat_lines)
+    try:
+        results = {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'corpus': args.corpus or 'synthetic',
+            'stages': {},
+        }
+        print(f"{'stage':<14} {'items':>9} {'items/sec':>14} {'peak KiB':>12}")
+        for name in args.stages:
+            stats = run_stage(STAGES[name], corpus, args.repeat)
+            results['stages'][name] = stats
+            print(f"{name:<14} {stats['items']:>9} {stats['items_per_sec']:>14,.0f} "
+                  f"{stats['peak_bytes'] / 1024:>12,.0f}")
+    finally:
+        corpus.cleanup()
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
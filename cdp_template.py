@@ -1,8 +1,13 @@
-import pychrome
 import subprocess
 import tempfile
 import time
-import base64
+
+from shopee_core.body_codec import decode_response_body
+from shopee_core.metrics import metrics
+from shopee_core.output_sinks import JsonlSink
+from shopee_core.processor import ShopeeDataProcessor
+from shopee_core.response_archive import ResponseArchive
+from response_pipeline import ResponsePipeline
 
 def launch_chrome_with_debugging():
     """Launch Chrome with remote debugging enabled"""
@@ -19,6 +24,9 @@ def launch_chrome_with_debugging():
     return subprocess.Popen(cmd)
 
 def main():
+    # Imported here so process_product_data can be used offline without pychrome
+    import pychrome
+    
     # Step 1: Launch Chrome process
     chrome_process = launch_chrome_with_debugging()
     time.sleep(3)  # Allow Chrome to initialize
@@ -29,6 +37,8 @@ def main():
     
     # Step 3: Configure network event callbacks
     requests_tracker = {}
+    sink = JsonlSink('shopee_cdp_scraped_data', basename='products')
+    archive = ResponseArchive('shopee_raw_archive')
     
     def on_request_will_be_sent(**kwargs):
         request_id = kwargs.get("requestId")
@@ -41,60 +51,104 @@ def main():
         if request_id in requests_tracker:
             requests_tracker[request_id]["status"] = response.get("status")
     
+    def handle_response(job):
+        """Fetch, decode, archive and process one finished response (worker thread)
+        
+        Errors propagate to the pipeline, which reports and counts them.
+        """
+        request_id, url = job
+        
+        # Extract response body via CDP
+        with metrics.timer('body_fetch'):
+            result = tab.Network.getResponseBody(requestId=request_id)
+        
+        # Base64 bodies stay as bytes; archive and parser both take them
+        with metrics.timer('decode'):
+            body = decode_response_body(result)
+        
+        # Keep the raw body so parsing changes can be replayed offline
+        archive.put(body, url)
+        
+        # Process the product data
+        process_product_data(body, url, sink)
+    
+    # Decoding, parsing and writing run on worker threads so slow processing
+    # never stalls pychrome's event dispatch
+    pipeline = ResponsePipeline(handle_response, workers=4, max_pending=256)
+    pipeline.start()
+    
     def on_loading_finished(**kwargs):
         request_id = kwargs.get("requestId")
-        url = requests_tracker.get(request_id, {}).get("url", "")
+        url = requests_tracker.pop(request_id, {}).get("url", "")
         
         # Filter for Shopee product API endpoints
         if "shopee.tw/api/v4/pdp/get_pc" in url:
-            try:
-                # Extract response body via CDP
-                result = tab.Network.getResponseBody(requestId=request_id)
-                body = result.get("body", "")
-                
-                if result.get("base64Encoded", False):
-                    body = base64.b64decode(body).decode("utf-8")
-                
-                # Process the product data
-                process_product_data(body, url)
-                
-            except Exception as e:
-                print(f"Error extracting response: {e}")
-    
-    # Step 4: Attach event handlers and enable network monitoring
-    tab.Network.requestWillBeSent = on_request_will_be_sent
-    tab.Network.responseReceived = on_response_received
-    tab.Network.loadingFinished = on_loading_finished
+            pipeline.submit((request_id, url))
     
-    # Start tab and enable network domain
-    tab.start()
-    tab.Network.enable()
-    
-    # Step 5: Navigate to Shopee product pages
-    product_urls = [
-        "https://shopee.tw/product/12345/67890",
-        # Add more URLs as needed
-    ]
-    
-    for url in product_urls:
-        print(f"Navigating to: {url}")
-        tab.Page.navigate(url=url)
-        time.sleep(15)  # Allow page to load and API calls to complete
+    try:
+        # Step 4: Attach event handlers and enable network monitoring
+        tab.Network.requestWillBeSent = on_request_will_be_sent
+        tab.Network.responseReceived = on_response_received
+        tab.Network.loadingFinished = on_loading_finished
         
-        # Optional: Clear session data between requests
-        tab.Network.clearBrowserCookies()
-        tab.Network.clearBrowserCache()
-    
-    # Cleanup
-    tab.stop()
-    browser.close_tab(tab)
-    chrome_process.terminate()
+        # Start tab and enable network domain
+        tab.start()
+        tab.Network.enable()
+        
+        # Step 5: Navigate to Shopee product pages
+        product_urls = [
+            "https://shopee.tw/product/12345/67890",
+            # Add more URLs as needed
+        ]
+        
+        for url in product_urls:
+            print(f"Navigating to: {url}")
+            tab.Page.navigate(url=url)
+            time.sleep(15)  # Allow page to load and API calls to complete
+            
+            # Optional: Clear session data between requests
+            tab.Network.clearBrowserCookies()
+            tab.Network.clearBrowserCache()
+        
+    finally:
+        # Drain queued responses while the tab can still serve their bodies;
+        # this also runs on Ctrl-C so queued jobs are not lost with the workers
+        pipeline.close()
+        try:
+            # Cleanup
+            tab.stop()
+            browser.close_tab(tab)
+            chrome_process.terminate()
+        finally:
+            # Flush the last partial batch and finalize the output file
+            sink.close()
+            
+    print(f"Extracted {sink.records_written} products "
+          f"({pipeline.error_count} responses failed)")
+    metrics.dump()
+
+_data_processor = ShopeeDataProcessor()
 
-def process_product_data(response_body, api_url):
-    """Process extracted product data from API response"""
+def process_product_data(response_body, api_url, sink=None, item_fields=None, defer_description=None):
+    """Process extracted product data from API response
+    
+    Pass `item_fields` (and optionally `defer_description`) to decode only
+    those members of `item` and skip the rest of the payload.
+    """
     # Parse JSON response and extract product details
-    # Implement your data processing logic here
-    pass
+    with metrics.timer('parse'):
+        product_data = _data_processor.process_api_body(
+            response_body, item_fields=item_fields, defer_description=defer_description
+        )
+    if not product_data:
+        metrics.incr('parse.empty')
+        return None
+        
+    product_data['source_url'] = api_url
+    if sink is not None:
+        with metrics.timer('sink_write'):
+            sink.write(product_data)
+    return product_data
 
 if __name__ == "__main__":
     main()
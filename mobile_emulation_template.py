@@ -6,12 +6,14 @@ Using Android Emulator + ADB Network Capture + Mobile Chrome
 
 import subprocess
 import time
-import json
 import threading
 import queue
-import re
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
+
+from shopee_core.metrics import metrics
+from shopee_core.output_sinks import JsonlSink, OutputSink
+from shopee_core.processor import SHOPEE_API_PATTERN, SHOPEE_API_PREFIX, ShopeeDataProcessor
 
 class AndroidEmulatorManager:
     """Manages Android emulator instances for mobile scraping"""
@@ -158,13 +160,42 @@ class MobileChromeManager:
         time.sleep(3)
         print(f"Navigated to: {product_url}")
 
+class CaptureQueue(queue.Queue):
+    """Bounded queue that can hand out many items per lock acquisition"""
+    
+    def get_batch(self, max_items: Optional[int] = 500, max_wait: float = 0.0) -> List:
+        """Remove and return up to `max_items` items (all of them if None)
+        
+        Waits up to `max_wait` seconds for `max_items` (or, without a limit,
+        one item) to be available, then returns whatever is queued.
+        """
+        with self.not_empty:
+            if max_wait > 0:
+                target = max_items or 1
+                self.not_empty.wait_for(lambda: self._qsize() >= target, timeout=max_wait)
+                
+            available = self._qsize()
+            count = available if max_items is None else min(max_items, available)
+            batch = [self._get() for _ in range(count)]
+            
+            # Wake producers waiting on the freed slots
+            if count:
+                self.not_full.notify(count)
+            return batch
+
 class NetworkTrafficCapture:
     """Captures network traffic through ADB monitoring"""
     
-    def __init__(self, adb_path: str = "adb"):
+    # Cheap substring check shared by every API pattern, run before the regex
+    API_PREFIX = SHOPEE_API_PREFIX
+    API_PATTERN = SHOPEE_API_PATTERN
+    
+    def __init__(self, adb_path: str = "adb", max_queued: int = 10000):
         self.adb_path = adb_path
         self.device_id = "emulator-5554"
-        self.capture_queue = queue.Queue()
+        # Bounded so a slow consumer cannot grow memory without limit
+        self.capture_queue = CaptureQueue(maxsize=max_queued)
+        self.dropped_count = 0
         self.is_capturing = False
         
     def start_traffic_capture(self):
@@ -187,89 +218,86 @@ class NetworkTrafficCapture:
                 "chromium:V", "*:S"
             ]
             
+            # Block-buffered pipe: lines are split from 64 KiB reads
             process = subprocess.Popen(
                 cmd, 
                 stdout=subprocess.PIPE, 
                 stderr=subprocess.PIPE,
                 text=True,
-                bufsize=1
+                bufsize=65536
             )
             
-            for line in iter(process.stdout.readline, ''):
-                if not self.is_capturing:
-                    break
-                    
-                # Filter for Shopee API endpoints
-                if self._is_shopee_api_request(line):
-                    self.capture_queue.put({
-                        'timestamp': datetime.now().isoformat(),
-                        'log_line': line.strip()
-                    })
+            self._process_log_stream(process.stdout)
                     
         except Exception as e:
             print(f"Error in network capture: {e}")
     
+    def _process_log_stream(self, stream) -> int:
+        """Queue Shopee API lines from a logcat stream, returning lines read"""
+        is_api_request = self._is_shopee_api_request
+        capture_queue = self.capture_queue
+        lines_read = 0
+        
+        for line in stream:
+            if not self.is_capturing:
+                break
+            lines_read += 1
+                
+            # Filter for Shopee API endpoints
+            if is_api_request(line):
+                with metrics.timer('capture'):
+                    try:
+                        capture_queue.put_nowait({
+                            'timestamp': datetime.now().isoformat(),
+                            'captured_at': time.monotonic(),
+                            'log_line': line.strip()
+                        })
+                        metrics.incr('capture.matched')
+                    except queue.Full:
+                        # Drop rather than block, so logcat keeps draining
+                        self.dropped_count += 1
+                        metrics.incr('capture.dropped')
+                    
+        metrics.incr('capture.lines_read', lines_read)
+        return lines_read
+    
     def _is_shopee_api_request(self, log_line: str) -> bool:
         """Check if log line contains Shopee API request"""
-        api_patterns = [
-            r'shopee\.tw/api/v4/pdp/get_pc',
-            r'shopee\.tw/api/v4/item/get',
-            r'shopee\.tw/api/v4/product/get_shop_info'
-        ]
-        
-        return any(re.search(pattern, log_line) for pattern in api_patterns)
+        return self.API_PREFIX in log_line and self.API_PATTERN.search(log_line) is not None
     
     def get_captured_data(self) -> List[Dict]:
         """Retrieve captured network data"""
-        captured_data = []
+        return self.get_captured_batch(max_items=None)
+    
+    def get_captured_batch(self, max_items: Optional[int] = 500, max_wait: float = 0.0) -> List[Dict]:
+        """Drain up to `max_items` captures under a single lock acquisition
         
-        while not self.capture_queue.empty():
-            try:
-                data = self.capture_queue.get_nowait()
-                captured_data.append(data)
-            except queue.Empty:
-                break
+        Waits up to `max_wait` seconds for the batch to fill, then returns
+        whatever has arrived (possibly an empty list).
+        """
+        batch = self.capture_queue.get_batch(max_items, max_wait)
+        
+        if metrics.enabled:
+            now = time.monotonic()
+            for capture in batch:
+                metrics.observe('queue_wait', now - capture.get('captured_at', now))
                 
-        return captured_data
+        return batch
+    
+    def iter_captured_batches(self, max_items: int = 500, max_wait: float = 1.0) -> Iterator[List[Dict]]:
+        """Yield non-empty batches of captures until capture stops and the queue is drained"""
+        while self.is_capturing or not self.capture_queue.empty():
+            batch = self.get_captured_batch(max_items, max_wait)
+            if batch:
+                yield batch
     
     def stop_traffic_capture(self):
         """Stop network traffic capture"""
         self.is_capturing = False
         print("Network traffic capture stopped")
-
-class ShopeeDataProcessor:
-    """Processes extracted Shopee product data"""
-    
-    def process_mobile_api_response(self, response_data: str) -> Dict:
-        """Process product data from mobile API responses"""
-        try:
-            # Extract JSON from log line (simplified)
-            json_match = re.search(r'\{.*\}', response_data)
-            if not json_match:
-                return {}
-                
-            json_str = json_match.group()
-            data = json.loads(json_str)
-            
-            # Extract product information
-            product_info = {
-                'product_id': data.get('item', {}).get('itemid'),
-                'shop_id': data.get('item', {}).get('shopid'),
-                'name': data.get('item', {}).get('name'),
-                'price': data.get('item', {}).get('price'),
-                'stock': data.get('item', {}).get('stock'),
-                'rating': data.get('item', {}).get('item_rating', {}).get('rating_star'),
-                'sold_count': data.get('item', {}).get('sold'),
-                'description': data.get('item', {}).get('description'),
-                'images': [img.get('image') for img in data.get('item', {}).get('images', [])],
-                'extracted_at': datetime.now().isoformat()
-            }
-            
-            return product_info
-            
-        except Exception as e:
-            print(f"Error processing API response: {e}")
-            return {}
+        if self.dropped_count:
+            print(f"Warning: dropped {self.dropped_count} captured API responses because the "
+                  f"capture queue was full (max_queued={self.capture_queue.maxsize})")
 
 class MobileShopeeScraperTemplate:
     """Main template class for mobile Shopee scraping"""
@@ -298,8 +326,12 @@ class MobileShopeeScraperTemplate:
         print("Mobile scraping environment ready!")
         return True
     
-    def scrape_product_data(self, product_urls: List[str]) -> List[Dict]:
-        """Scrape product data from list of URLs"""
+    def scrape_product_data(self, product_urls: List[str], sink: Optional[OutputSink] = None) -> List[Dict]:
+        """Scrape product data from list of URLs
+        
+        When a sink is given, records are streamed to it as they arrive and
+        are not collected in the returned list.
+        """
         scraped_data = []
         
         for url in product_urls:
@@ -309,20 +341,30 @@ class MobileShopeeScraperTemplate:
                 # Navigate to product page
                 self.chrome_manager.navigate_to_product(url)
                 
-                # Wait for page load and API calls
-                time.sleep(10)
-                
-                # Collect captured network data
-                captured_data = self.network_capture.get_captured_data()
-                
-                # Process each captured API response
-                for capture in captured_data:
-                    product_data = self.data_processor.process_mobile_api_response(
-                        capture['log_line']
+                # Process captured API responses in batches while the page
+                # loads, instead of sleeping through the whole load window
+                deadline = time.monotonic() + 10
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                        
+                    captured_data = self.network_capture.get_captured_batch(
+                        max_items=100, max_wait=min(1.0, remaining)
                     )
-                    if product_data:
-                        product_data['source_url'] = url
-                        scraped_data.append(product_data)
+                    
+                    for capture in captured_data:
+                        with metrics.timer('parse'):
+                            product_data = self.data_processor.process_mobile_api_response(
+                                capture['log_line']
+                            )
+                        if product_data:
+                            product_data['source_url'] = url
+                            if sink is not None:
+                                with metrics.timer('sink_write'):
+                                    sink.write(product_data)
+                            else:
+                                scraped_data.append(product_data)
                         
                 # Add delay between requests
                 time.sleep(5)
@@ -359,15 +401,13 @@ def main():
             # Add more URLs as needed
         ]
         
-        # Scrape product data
+        # Scrape product data, streaming results to disk in batches
         print("Starting product data scraping...")
-        scraped_data = scraper.scrape_product_data(product_urls)
-        
-        # Save results
-        with open('shopee_mobile_scraped_data.json', 'w', encoding='utf-8') as f:
-            json.dump(scraped_data, f, ensure_ascii=False, indent=2)
+        with JsonlSink('shopee_mobile_scraped_data', basename='products') as sink:
+            scraper.scrape_product_data(product_urls, sink=sink)
             
-        print(f"Scraping completed! Extracted {len(scraped_data)} products")
+        print(f"Scraping completed! Extracted {sink.records_written} products")
+        metrics.dump()
         
     except KeyboardInterrupt:
         print("Scraping interrupted by user")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Bounded Worker Pipeline for Captured Responses
+Keeps event callbacks cheap by handing decode/parse/write work to a thread pool
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from shopee_core.metrics import metrics
+
+# Marks the end of the queue for one worker
+_STOP = object()
+
+
+class ResponsePipeline:
+    """Fixed-size thread pool fed by a bounded queue
+
+    Producers call submit(), which blocks once `max_pending` jobs are
+    waiting; that backpressure keeps memory bounded when the handler falls
+    behind. close() lets the workers drain everything already submitted
+    before they exit.
+    """
+
+    def __init__(self, handler: Callable[[Any], None], workers: int = 4, max_pending: int = 256):
+        self.handler = handler
+        self.workers = workers
+        self.processed_count = 0
+        self.error_count = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+        self._threads: List[threading.Thread] = []
+        self._count_lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        """Start the worker threads"""
+        for index in range(self.workers):
+            worker = threading.Thread(
+                target=self._worker_loop, name=f"response-worker-{index}", daemon=True
+            )
+            worker.start()
+            self._threads.append(worker)
+
+    def submit(self, job: Any, timeout: Optional[float] = None):
+        """Queue a job, blocking while the queue is full
+
+        Raises queue.Full if `timeout` expires first.
+        """
+        if self._closed:
+            raise RuntimeError("Pipeline is closed")
+        self._queue.put((job, time.monotonic()), timeout=timeout)
+
+    def pending(self) -> int:
+        """Approximate number of queued jobs"""
+        return self._queue.qsize()
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop accepting jobs, wait for queued ones to finish and join the workers"""
+        if self._closed:
+            return
+        self._closed = True
+
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for worker in self._threads:
+            worker.join(timeout)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _worker_loop(self):
+        while True:
+            queued = self._queue.get()
+            if queued is _STOP:
+                return
+
+            job, submitted_at = queued
+            metrics.observe('queue_wait', time.monotonic() - submitted_at)
+            try:
+                self.handler(job)
+                with self._count_lock:
+                    self.processed_count += 1
+            except Exception as e:
+                with self._count_lock:
+                    self.error_count += 1
+                metrics.incr('pipeline.errors')
+                print(f"Error processing queued response: {e}")
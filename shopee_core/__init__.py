@@ -0,0 +1,48 @@
+"""
+Shopee Data Processing Core
+Offline processing of captured Shopee data, importable without the browser or HTTP stack
+
+Public names are loaded on first access, so `from shopee_core import
+ShopeeDataProcessor` only imports the processor and its small helpers;
+NumPy, SQLite and multiprocessing load only with the modules that use them.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'ShopeeDataProcessor': 'processor',
+    'SHOPEE_API_PATTERN': 'processor',
+    'SHOPEE_API_PREFIX': 'processor',
+    'ProductRecord': 'product_record',
+    'parse_item_projection': 'projected_parser',
+    'RawJSON': 'projected_parser',
+    'decode_response_body': 'body_codec',
+    'OutputSink': 'output_sinks',
+    'JsonlSink': 'output_sinks',
+    'GzipJsonlSink': 'output_sinks',
+    'ColumnarSink': 'output_sinks',
+    'open_sink': 'output_sinks',
+    'ProductStore': 'product_store',
+    'ResponseArchive': 'response_archive',
+    'ImageIndex': 'image_index',
+    'TimeSeriesIndex': 'timeseries_index',
+    'ProductReport': 'report',
+    'metrics': 'metrics',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # Cache so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
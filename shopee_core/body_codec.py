@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Response Body Decoding Helpers
+Keeps captured bodies as bytes from the CDP result through archiving and json.loads
+"""
+
+import binascii
+from typing import Dict, Union
+
+BodyBuffer = Union[bytes, bytearray, memoryview]
+
+
+def decode_response_body(result: Dict) -> Union[str, bytes]:
+    """Return the body of a Network.getResponseBody result without extra copies
+
+    Base64 bodies are decoded straight from the ASCII str into bytes
+    (base64.b64decode would first copy the str into an ASCII bytes object),
+    and are left undecoded: json.loads and the archive both take bytes.
+    Plain-text bodies are returned as the str CDP delivered.
+    """
+    body = result.get("body", "")
+    if result.get("base64Encoded", False):
+        return binascii.a2b_base64(body)
+    return body
+
+
+def as_json_input(body: Union[str, BodyBuffer]) -> Union[str, bytes, bytearray]:
+    """Adapt a body for json.loads, which accepts str/bytes/bytearray but not memoryview
+
+    A memoryview spanning a whole bytes object is unwrapped to that object
+    instead of being copied; only partial or non-bytes views are materialized.
+    """
+    if not isinstance(body, memoryview):
+        return body
+
+    owner = body.obj
+    if isinstance(owner, (bytes, bytearray)) and body.contiguous and body.nbytes == len(owner):
+        return owner
+    return body.tobytes()
+
+
+def as_bytes(body: Union[str, BodyBuffer]) -> BodyBuffer:
+    """Return a buffer for hashing/compression, encoding only when given a str"""
+    if isinstance(body, str):
+        return body.encode('utf-8')
+    return body
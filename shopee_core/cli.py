@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Command Line Entry Point for the Processing Tools
+
+    python -m shopee_core extract   captures.log --output out/
+    python -m shopee_core reprocess --archive shopee_raw_archive --output out/
+    python -m shopee_core report    shopee_products.db
+
+Each command's module is imported only when that command runs, so short
+batch jobs do not pay for dependencies they never use.
+"""
+
+import importlib
+import sys
+from typing import List, Optional
+
+# Command -> (module, one-line help)
+COMMANDS = {
+    'extract': ('extract', "extract products from captured log lines or bodies"),
+    'reprocess': ('reprocess', "re-extract archived captures across a process pool"),
+    'report': ('report', "per-shop aggregates over a product store"),
+}
+
+
+def _usage() -> str:
+    lines = ["usage: python -m shopee_core <command> [options]", "", "commands:"]
+    for name, (_, description) in COMMANDS.items():
+        lines.append(f"  {name:<10} {description}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Dispatch to a command's main(argv)"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print(_usage())
+        return 0 if argv else 2
+
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"Unknown command: {command}\n\n{_usage()}", file=sys.stderr)
+        return 2
+
+    module = importlib.import_module(f".{COMMANDS[command][0]}", __package__)
+    return module.main(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Image Hash Interning Index
+Maps repeated image hashes to compact integer ids, persisted as an append-only file
+"""
+
+import os
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+
+class ImageIndex:
+    """Append-only hash -> id table
+
+    The file holds one image hash per line; a hash's id is its line number,
+    so ids are stable across runs and the file only ever grows. New hashes
+    are appended on flush(), which callers (e.g. ProductStore) run before
+    committing records that reference them.
+    """
+
+    def __init__(self, path: str = "shopee_products.db.images"):
+        self.path = path
+        self._ids: Dict[str, int] = {}
+        self._hashes: List[str] = []
+        self._unflushed = 0
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, 'r+', encoding='utf-8') as f:
+            content = f.read()
+            if content and not content.endswith('\n'):
+                # Drop a line cut short by a crash; nothing committed refers to it
+                content = content[:content.rfind('\n') + 1]
+                f.seek(0)
+                f.truncate(len(content.encode('utf-8')))
+
+        for image_hash in content.splitlines():
+            self._ids[image_hash] = len(self._hashes)
+            self._hashes.append(image_hash)
+
+    @classmethod
+    def for_store(cls, db_path: str) -> "ImageIndex":
+        """Index persisted next to a ProductStore database"""
+        return cls(db_path + ".images")
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def intern(self, image_hash: str) -> int:
+        """Return the id of a hash, assigning the next id if it is new"""
+        image_id = self._ids.get(image_hash)
+        if image_id is not None:
+            return image_id
+        with self._lock:
+            image_id = self._ids.get(image_hash)
+            if image_id is None:
+                image_id = len(self._hashes)
+                self._hashes.append(image_hash)
+                self._ids[image_hash] = image_id
+                self._unflushed += 1
+            return image_id
+
+    def encode(self, image_hashes: Iterable[Optional[str]]) -> array:
+        """Intern a list of hashes into an unsigned int array, skipping empty entries"""
+        return array('I', [self.intern(image_hash) for image_hash in image_hashes if image_hash])
+
+    def decode(self, image_ids: Iterable[int]) -> List[str]:
+        """Map ids back to image hashes"""
+        hashes = self._hashes
+        return [hashes[image_id] for image_id in image_ids]
+
+    def flush(self):
+        """Append hashes assigned since the last flush"""
+        with self._lock:
+            if not self._unflushed:
+                return
+            new_hashes = self._hashes[len(self._hashes) - self._unflushed:]
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(''.join(image_hash + '\n' for image_hash in new_hashes))
+                f.flush()
+                os.fsync(f.fileno())
+            self._unflushed = 0
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Lightweight Pipeline Metrics
+Per-stage counters and latency histograms, near-free when disabled
+
+Enable with the SHOPEE_METRICS environment variable ("stdout" or a file
+path) or by calling metrics.enable(). Stages used across the scrapers:
+capture, queue_wait, body_fetch, decode, parse, sink_write.
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+
+class Histogram:
+    """Latency histogram with power-of-two microsecond buckets"""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets: Dict[int, int] = {}
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        # Bucket key is the upper bound in microseconds
+        bound = 1 << max(0, math.ceil(math.log2(max(seconds * 1e6, 1))))
+        self.buckets[bound] = self.buckets.get(bound, 0) + 1
+
+    def percentile(self, fraction: float) -> float:
+        """Approximate percentile in seconds (bucket upper bound)"""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for bound in sorted(self.buckets):
+            seen += self.buckets[bound]
+            if seen >= target:
+                return min(bound / 1e6, self.max)
+        return self.max
+
+    def summary(self) -> Dict:
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'total_s': round(self.total, 6),
+            'mean_ms': round(self.total / self.count * 1e3, 4),
+            'min_ms': round(self.min * 1e3, 4),
+            'p50_ms': round(self.percentile(0.50) * 1e3, 4),
+            'p95_ms': round(self.percentile(0.95) * 1e3, 4),
+            'p99_ms': round(self.percentile(0.99) * 1e3, 4),
+            'max_ms': round(self.max * 1e3, 4),
+        }
+
+
+class _Timer:
+    __slots__ = ('metrics', 'stage', 'start')
+
+    def __init__(self, metrics: "Metrics", stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """Process-wide registry of counters and per-stage latency histograms"""
+
+    def __init__(self, output: Optional[str] = None):
+        self.enabled = False
+        self.output = output
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self._started = time.time()
+
+    def enable(self, output: Optional[str] = None):
+        """Start recording; `output` is "stdout" or a file path for dump()"""
+        self.enabled = True
+        if output:
+            self.output = output
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self._started = time.time()
+
+    def incr(self, name: str, amount: int = 1):
+        """Add to a counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, stage: str, seconds: float):
+        """Record one latency sample for a stage"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.observe(seconds)
+
+    def timer(self, stage: str):
+        """Context manager timing a block into the stage histogram"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, stage)
+
+    def snapshot(self) -> Dict:
+        """Current counters and histogram summaries"""
+        with self._lock:
+            return {
+                'timestamp': time.time(),
+                'elapsed_s': round(time.time() - self._started, 3),
+                'counters': dict(self.counters),
+                'stages': {stage: histogram.summary() for stage, histogram in sorted(self.histograms.items())},
+            }
+
+    def dump(self, output: Optional[str] = None):
+        """Write a snapshot to stdout or append it as one JSON line to a file"""
+        if not self.enabled:
+            return
+        output = output or self.output or "stdout"
+        snapshot = self.snapshot()
+
+        if output == "stdout":
+            print("Pipeline metrics:")
+            for name, value in sorted(snapshot['counters'].items()):
+                print(f"  {name:<28} {value:>12}")
+            for stage, summary in snapshot['stages'].items():
+                if summary['count']:
+                    print(f"  {stage:<28} n={summary['count']:<8} mean={summary['mean_ms']:.3f}ms "
+                          f"p95={summary['p95_ms']:.3f}ms max={summary['max_ms']:.3f}ms")
+            sys.stdout.flush()
+            return
+
+        with open(output, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(snapshot) + '\n')
+
+
+def _from_env() -> Metrics:
+    registry = Metrics()
+    output = os.environ.get("SHOPEE_METRICS")
+    if output:
+        registry.enable("stdout" if output in ("1", "true", "stdout") else output)
+    return registry
+
+
+# Shared registry used by the scrapers and processing modules
+metrics = _from_env()
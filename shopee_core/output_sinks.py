@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Streaming Output Sinks for Scraped Shopee Data
+Bounded-memory JSONL / gzip-JSONL / chunked columnar writers with atomic rotation
+"""
+
+import gzip
+import json
+import os
+import re
+import threading
+import zlib
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from .metrics import metrics
+
+if TYPE_CHECKING:
+    from .image_index import ImageIndex
+
+
+def record_to_dict(record) -> Dict:
+    """Return a plain dict for any record type the sinks accept"""
+    if isinstance(record, dict):
+        return record
+    return record.to_dict()
+
+
+class OutputSink:
+    """Base class for sinks that buffer records and flush them in fixed-size batches
+
+    Records carrying interned `image_ids` (from a ShopeeDataProcessor with an
+    ImageIndex) need that index passed as `image_index`; it is flushed
+    before each batch is written, so no record on disk refers to an id
+    missing from the index file.
+    """
+
+    def __init__(self, output_dir: str, basename: str = "shopee_scraped_data",
+                 batch_size: int = 500, records_per_file: int = 100_000,
+                 image_index: Optional["ImageIndex"] = None):
+        self.output_dir = output_dir
+        self.basename = basename
+        self.batch_size = batch_size
+        self.records_per_file = records_per_file
+        self.image_index = image_index
+        self.records_written = 0
+        self.completed_files: List[str] = []
+        self._buffer: List[Dict] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+        os.makedirs(output_dir, exist_ok=True)
+        # Continue after files left by earlier runs, finished or not, so a
+        # rerun into the same directory never truncates or replaces them
+        self._file_index = self._last_file_index()
+
+    def write(self, record):
+        """Buffer one record, flushing when the batch is full"""
+        with self._lock:
+            self._buffer.append(record_to_dict(record))
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def write_many(self, records: Iterable):
+        """Buffer several records, flushing as batches fill up"""
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """Write any buffered records to disk"""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """Flush remaining records and finalize the current file"""
+        with self._lock:
+            if self._closed:
+                return
+            self._flush_locked()
+            self._finalize_file()
+            self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _last_file_index(self) -> int:
+        """Return the highest file number already used for `basename` in output_dir"""
+        pattern = re.compile(re.escape(self.basename) + r"-(\d+)\.")
+        indexes = [
+            int(match.group(1)) for match in map(pattern.match, os.listdir(self.output_dir)) if match
+        ]
+        return max(indexes, default=0)
+
+    def _next_path(self, extension: str) -> str:
+        """Return the final path of the next output file"""
+        self._file_index += 1
+        return os.path.join(
+            self.output_dir, f"{self.basename}-{self._file_index:05d}{extension}"
+        )
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        if self.image_index is not None:
+            # Ids referenced by this batch must be on disk before it is
+            self.image_index.flush()
+        with metrics.timer('sink_flush'):
+            self._write_batch(batch)
+        self.records_written += len(batch)
+        metrics.incr('sink.records', len(batch))
+
+    def _write_batch(self, batch: List[Dict]):
+        raise NotImplementedError
+
+    def _finalize_file(self):
+        """Hook for sinks that keep a file open between batches"""
+
+
+class JsonlSink(OutputSink):
+    """Writes one JSON document per line, rotating files atomically
+
+    Records are appended to `<name>.part` and flushed after every batch, so a
+    crash keeps everything up to the last batch. On rotation or close the
+    part file is renamed to its final name with os.replace().
+    """
+
+    extension = ".jsonl"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._file = None
+        self._final_path: Optional[str] = None
+        self._records_in_file = 0
+
+    def _open_file(self, path: str):
+        return open(path, 'x', encoding='utf-8')
+
+    def _write_text(self, text: str):
+        self._file.write(text)
+
+    def _sync_file(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _write_batch(self, batch: List[Dict]):
+        while batch:
+            if self._file is None:
+                self._final_path = self._next_path(self.extension)
+                self._file = self._open_file(self._final_path + ".part")
+                self._records_in_file = 0
+
+            room = self.records_per_file - self._records_in_file
+            chunk, batch = batch[:room], batch[room:]
+            self._write_text(''.join(
+                json.dumps(record, ensure_ascii=False) + '\n' for record in chunk
+            ))
+            self._records_in_file += len(chunk)
+            self._sync_file()
+
+            if self._records_in_file >= self.records_per_file:
+                self._finalize_file()
+
+    def _close_file(self):
+        self._file.close()
+
+    def _finalize_file(self):
+        if self._file is None:
+            return
+        self._close_file()
+        os.replace(self._final_path + ".part", self._final_path)
+        self.completed_files.append(self._final_path)
+        self._file = None
+        self._final_path = None
+
+
+class GzipJsonlSink(JsonlSink):
+    """JSONL sink with gzip compression
+
+    Each batch ends with a zlib sync flush, so a part file left behind by a
+    crash still decompresses up to the last completed batch.
+    """
+
+    extension = ".jsonl.gz"
+
+    def __init__(self, *args, compresslevel: int = 6, **kwargs):
+        self.compresslevel = compresslevel
+        super().__init__(*args, **kwargs)
+
+    def _open_file(self, path: str):
+        self._raw_file = open(path, 'xb')
+        return gzip.GzipFile(fileobj=self._raw_file, mode='wb', compresslevel=self.compresslevel)
+
+    def _write_text(self, text: str):
+        self._file.write(text.encode('utf-8'))
+
+    def _sync_file(self):
+        self._file.flush(zlib.Z_SYNC_FLUSH)
+        self._raw_file.flush()
+        os.fsync(self._raw_file.fileno())
+
+    def _close_file(self):
+        self._file.close()
+        self._raw_file.close()
+
+
+class ColumnarSink(OutputSink):
+    """Writes each batch as a column-oriented chunk file
+
+    A chunk is a JSON object mapping each field to the list of its values.
+    Chunks are written to a temporary file and renamed into place, so every
+    chunk on disk is complete.
+    """
+
+    extension = ".columns.json"
+
+    def _write_batch(self, batch: List[Dict]):
+        columns: Dict[str, List] = {}
+        for row, record in enumerate(batch):
+            for key, value in record.items():
+                # Pad columns first seen part-way through the batch
+                columns.setdefault(key, [None] * row).append(value)
+            for key, values in columns.items():
+                if len(values) <= row:
+                    values.append(None)
+
+        path = self._next_path(self.extension)
+        with open(path + ".part", 'x', encoding='utf-8') as f:
+            json.dump({'num_rows': len(batch), 'columns': columns}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".part", path)
+        self.completed_files.append(path)
+
+
+SINK_TYPES = {
+    'jsonl': JsonlSink,
+    'jsonl.gz': GzipJsonlSink,
+    'columnar': ColumnarSink,
+}
+
+
+def open_sink(kind: str, output_dir: str, **kwargs) -> OutputSink:
+    """Create a sink by name ('jsonl', 'jsonl.gz' or 'columnar')"""
+    try:
+        sink_class = SINK_TYPES[kind]
+    except KeyError:
+        raise ValueError(f"Unknown sink type: {kind!r} (expected one of {sorted(SINK_TYPES)})")
+    return sink_class(output_dir, **kwargs)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Shopee Product Data Processor
+Turns captured log lines and API response bodies into normalized product records
+"""
+
+import json
+import re
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional, Union
+
+from .body_codec import BodyBuffer, as_json_input
+from .product_record import ProductRecord
+from .projected_parser import DEFAULT_ITEM_FIELDS, RawJSON, parse_item_projection
+
+if TYPE_CHECKING:
+    from .image_index import ImageIndex
+
+# Cheap substring shared by every product API URL, checked before the regex
+SHOPEE_API_PREFIX = 'shopee.tw/api/v4/'
+SHOPEE_API_PATTERN = re.compile(
+    r'shopee\.tw/api/v4/(?:pdp/get_pc|item/get|product/get_shop_info)'
+)
+
+# `item` members without which a document is not a product
+_KEY_FIELDS = ('itemid', 'shopid')
+
+class ShopeeDataProcessor:
+    """Processes extracted Shopee product data"""
+    
+    def __init__(self, compact_records: bool = False, item_fields: Optional[Iterable[str]] = None,
+                 defer_description: bool = False, image_index: Optional["ImageIndex"] = None):
+        # Emit slotted ProductRecord objects instead of dicts
+        self.compact_records = compact_records
+        # Projection mode: decode only these `item` members (see projected_parser)
+        self.item_fields = tuple(item_fields) if item_fields else None
+        # Leave `description` undecoded; compact records decode it on access,
+        # dict records get None
+        self.defer_description = defer_description
+        # Replace image hash lists with interned `image_ids`. New ids reach the
+        # index file only on flush(), so give the same index to the sink or
+        # ProductStore receiving the records; both flush it before writing
+        self.image_index = image_index
+        self._decoder = json.JSONDecoder()
+    
+    def process_mobile_api_response(self, response_data: str) -> Dict:
+        """Process product data from mobile API responses
+        
+        In projection mode (item_fields/defer_description) the JSON after the
+        first '{' is scanned for `item` instead of being fully decoded.
+        """
+        try:
+            projection = self._projection()
+            if projection is not None:
+                start = response_data.find('{')
+                if start < 0:
+                    return {}
+                item = parse_item_projection(response_data, *projection, start=start)
+                return self._build_product_info({'item': item}) if item is not None else {}
+                
+            # Extract JSON from log line (simplified)
+            json_match = re.search(r'\{.*\}', response_data)
+            if not json_match:
+                return {}
+                
+            json_str = json_match.group()
+            data = json.loads(json_str)
+            
+            return self._build_product_info(data)
+            
+        except Exception as e:
+            print(f"Error processing API response: {e}")
+            return {}
+    
+    def process_api_body(self, response_body: Union[str, BodyBuffer],
+                         item_fields: Optional[Iterable[str]] = None,
+                         defer_description: Optional[bool] = None) -> Dict:
+        """Process product data from a complete API response body (e.g. get_pc)
+        
+        Bytes and memoryviews are parsed directly, without an intermediate str.
+        `item_fields`/`defer_description` override the processor's projection
+        settings for this call.
+        """
+        try:
+            projection = self._projection(item_fields, defer_description)
+            if projection is not None:
+                item = parse_item_projection(as_json_input(response_body), *projection)
+                return self._build_product_info({'item': item}) if item is not None else {}
+                
+            return self._build_product_info(json.loads(as_json_input(response_body)))
+            
+        except Exception as e:
+            print(f"Error processing API response: {e}")
+            return {}
+    
+    def iter_mobile_api_responses(self, responses: Iterable[Union[str, bytes]]) -> Iterator[Dict]:
+        """Lazily process an iterable of captured log lines or response bodies
+        
+        Each entry is decoded incrementally starting at its first '{', so only
+        one document is held in memory at a time. Entries without a JSON
+        document, without a product item or that fail to decode are skipped.
+        """
+        decoder = self._decoder
+        projection = self._projection()
+        
+        for response_data in responses:
+            if isinstance(response_data, (bytes, bytearray)):
+                response_data = response_data.decode('utf-8', errors='replace')
+                
+            start = response_data.find('{')
+            if start < 0:
+                continue
+                
+            try:
+                if projection is not None:
+                    item = parse_item_projection(response_data, *projection, start=start)
+                    if item is None:
+                        continue
+                    data = {'item': item}
+                else:
+                    data, _ = decoder.raw_decode(response_data, start)
+                product_info = self._build_product_info(data)
+            except Exception as e:
+                print(f"Error processing API response: {e}")
+                continue
+                
+            if product_info:
+                yield product_info
+    
+    def _projection(self, item_fields: Optional[Iterable[str]] = None,
+                    defer_description: Optional[bool] = None) -> Optional[tuple]:
+        """Return (fields, deferred) for parse_item_projection, or None for a full parse"""
+        fields = item_fields or self.item_fields
+        defer = self.defer_description if defer_description is None else defer_description
+        if not fields and not defer:
+            return None
+        # The key fields are always needed to tell a product from an empty record
+        fields = tuple(fields or DEFAULT_ITEM_FIELDS)
+        fields += tuple(key for key in _KEY_FIELDS if key not in fields)
+        return fields, ('description',) if defer else ()
+    
+    def _build_product_info(self, data: Dict) -> Dict:
+        """Build a normalized product record from a decoded API document
+        
+        Returns {} when the document has no item with an itemid and shopid.
+        """
+        if not isinstance(data, dict):
+            return {}
+        # PC endpoints wrap the item in a `data` envelope
+        if isinstance(data.get('data'), dict):
+            data = data['data']
+            
+        # Look the item up once instead of once per field
+        item = data.get('item')
+        if not isinstance(item, dict) or any(item.get(key) is None for key in _KEY_FIELDS):
+            return {}
+            
+        if self.compact_records:
+            return ProductRecord.from_item(item, image_index=self.image_index)
+            
+        description = item.get('description')
+        if isinstance(description, RawJSON):
+            # Deferred by a projected parse; dicts must stay JSON-serializable
+            description = None
+            
+        # Extract product information
+        product_info = {
+            'product_id': item.get('itemid'),
+            'shop_id': item.get('shopid'),
+            'name': item.get('name'),
+            'price': item.get('price'),
+            'stock': item.get('stock'),
+            'rating': (item.get('item_rating') or {}).get('rating_star'),
+            'sold_count': item.get('sold'),
+            'description': description,
+            'images': [img.get('image') for img in item.get('images') or []],
+            'extracted_at': datetime.now().isoformat()
+        }
+        
+        if self.image_index is not None:
+            product_info['image_ids'] = self.image_index.encode(product_info.pop('images')).tolist()
+            
+        return product_info
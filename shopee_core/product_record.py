@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Compact Product Record Type
+Slotted alternative to the per-product dict built by ShopeeDataProcessor
+"""
+
+import zlib
+from datetime import datetime
+from array import array
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union
+
+from .projected_parser import RawJSON
+
+if TYPE_CHECKING:
+    from .image_index import ImageIndex
+
+# Order matches the dict built by ShopeeDataProcessor, plus source_url
+FIELDS = (
+    'product_id', 'shop_id', 'name', 'price', 'stock', 'rating', 'sold_count',
+    'description', 'images', 'extracted_at', 'source_url',
+)
+
+# Export shape of records backed by an ImageIndex
+INDEXED_FIELDS = tuple('image_ids' if field == 'images' else field for field in FIELDS)
+
+# Descriptions at least this long are kept zlib-compressed until read
+DESCRIPTION_COMPRESS_THRESHOLD = 256
+
+# Shop ids repeat across many products; share one int object per shop
+_shop_ids: Dict[int, int] = {}
+
+
+def intern_shop_id(shop_id):
+    """Return the shared object for a shop id"""
+    if shop_id is None:
+        return None
+    return _shop_ids.setdefault(shop_id, shop_id)
+
+
+def _pack_images(images: List[str]):
+    """Pack 32-char hex image hashes into one bytes object (16 bytes each)
+
+    Falls back to a tuple when any entry is not a 32-char hex hash.
+    """
+    if not images:
+        return None
+    try:
+        if all(len(image) == 32 for image in images):
+            joined = ''.join(images)
+            packed = bytes.fromhex(joined)
+            # Only pack when the round trip is exact (e.g. lowercase hex)
+            if packed.hex() == joined:
+                return packed
+    except (TypeError, ValueError):
+        pass
+    return tuple(images)
+
+
+def _unpack_images(packed) -> List[str]:
+    if packed is None:
+        return []
+    if isinstance(packed, bytes):
+        return [packed[offset:offset + 16].hex() for offset in range(0, len(packed), 16)]
+    return list(packed)
+
+
+class ProductRecord:
+    """Slotted product record with lazily materialized description and images
+
+    Long descriptions are held zlib-compressed and image hashes are packed
+    into a single bytes object, or into an array of ids when an ImageIndex
+    is given; both are rebuilt only when accessed. The
+    record supports the read side of the dict interface used by the sinks
+    and the product store, plus item assignment for known fields.
+    """
+
+    __slots__ = (
+        'product_id', 'shop_id', 'name', 'price', 'stock', 'rating', 'sold_count',
+        '_description', '_images', 'extracted_at', 'source_url', '_image_index',
+    )
+
+    def __init__(self, product_id=None, shop_id=None, name=None, price=None, stock=None,
+                 rating=None, sold_count=None, description: Optional[str] = None,
+                 images: Optional[List[str]] = None, extracted_at: Optional[str] = None,
+                 source_url: Optional[str] = None, image_index: Optional["ImageIndex"] = None):
+        self._image_index = image_index
+        self.product_id = product_id
+        self.shop_id = intern_shop_id(shop_id)
+        self.name = name
+        self.price = price
+        self.stock = stock
+        self.rating = rating
+        self.sold_count = sold_count
+        self.description = description
+        self.images = images
+        self.extracted_at = extracted_at
+        self.source_url = source_url
+
+    @classmethod
+    def from_item(cls, item: Dict, extracted_at: Optional[str] = None,
+                  image_index: Optional["ImageIndex"] = None) -> "ProductRecord":
+        """Build a record from the `item` object of an API response"""
+        return cls(
+            product_id=item.get('itemid'),
+            shop_id=item.get('shopid'),
+            name=item.get('name'),
+            price=item.get('price'),
+            stock=item.get('stock'),
+            rating=(item.get('item_rating') or {}).get('rating_star'),
+            sold_count=item.get('sold'),
+            description=item.get('description'),
+            images=[img.get('image') for img in item.get('images') or []],
+            extracted_at=extracted_at or datetime.now().isoformat(),
+            image_index=image_index,
+        )
+
+    @classmethod
+    def from_dict(cls, record: Dict) -> "ProductRecord":
+        """Build a record from a product dict"""
+        return cls(**{field: record.get(field) for field in FIELDS})
+
+    @property
+    def description(self) -> Optional[str]:
+        value = self._description
+        if isinstance(value, bytes):
+            return zlib.decompress(value).decode('utf-8')
+        if isinstance(value, RawJSON):
+            return value.load()
+        return value
+
+    @description.setter
+    def description(self, value: Union[str, RawJSON, None]):
+        # Deferred descriptions from a projected parse stay undecoded until read
+        if isinstance(value, str) and len(value) >= DESCRIPTION_COMPRESS_THRESHOLD:
+            value = zlib.compress(value.encode('utf-8'))
+        self._description = value
+
+    @property
+    def images(self) -> List[str]:
+        if isinstance(self._images, array):
+            return self._image_index.decode(self._images)
+        return _unpack_images(self._images)
+
+    @images.setter
+    def images(self, value: Optional[List[str]]):
+        if self._image_index is not None:
+            self._images = self._image_index.encode(value or ())
+        else:
+            self._images = _pack_images(value)
+
+    @property
+    def image_ids(self) -> Optional[List[int]]:
+        """Interned image ids, or None when the record has no ImageIndex"""
+        if isinstance(self._images, array):
+            return self._images.tolist()
+        return None
+
+    def _fields(self) -> Tuple[str, ...]:
+        """Keys of to_dict() for this record"""
+        return INDEXED_FIELDS if isinstance(self._images, array) else FIELDS
+
+    def to_dict(self) -> Dict:
+        """Export as the plain dict the sinks and product store expect
+
+        Records backed by an ImageIndex export `image_ids` in place of
+        `images`; the mapping methods below follow the same shape.
+        """
+        return {field: getattr(self, field) for field in self._fields()}
+
+    def keys(self) -> Iterator[str]:
+        return iter(self._fields())
+
+    def items(self) -> Iterator[Tuple[str, object]]:
+        return iter(self.to_dict().items())
+
+    def get(self, key: str, default=None):
+        if key not in self._fields():
+            return default
+        return getattr(self, key)
+
+    def __getitem__(self, key: str):
+        if key not in self._fields():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key not in FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._fields()
+
+    def __len__(self) -> int:
+        return len(self._fields())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ProductRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ProductRecord(shop_id={self.shop_id!r}, product_id={self.product_id!r}, name={self.name!r})"
+
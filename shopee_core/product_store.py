@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Incremental SQLite Product Store
+Keeps the latest snapshot per (shop_id, product_id) and appends only price/stock/sold deltas
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .metrics import metrics
+from .output_sinks import record_to_dict
+
+if TYPE_CHECKING:
+    from .image_index import ImageIndex
+
+# Fields that change on every capture and must not affect the content hash
+VOLATILE_FIELDS = ('extracted_at', 'source_url')
+
+# Fields tracked in the change log
+TRACKED_FIELDS = ('price', 'stock', 'sold_count')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    shop_id INTEGER NOT NULL,
+    product_id INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    record TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    update_seq INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (shop_id, product_id)
+);
+
+CREATE TABLE IF NOT EXISTS product_changes (
+    change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    shop_id INTEGER NOT NULL,
+    product_id INTEGER NOT NULL,
+    observed_at TEXT NOT NULL,
+    price INTEGER,
+    stock INTEGER,
+    sold_count INTEGER,
+    price_delta INTEGER,
+    stock_delta INTEGER,
+    sold_count_delta INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS product_changes_by_item
+    ON product_changes (shop_id, product_id, change_id);
+"""
+
+# Applied after SCHEMA; stores created before update_seq existed get the column here
+MIGRATIONS = (
+    ("products", "update_seq", "ALTER TABLE products ADD COLUMN update_seq INTEGER NOT NULL DEFAULT 0"),
+)
+
+POST_MIGRATION_SCHEMA = """
+CREATE INDEX IF NOT EXISTS products_by_update_seq ON products (update_seq);
+"""
+
+
+def content_hash(record: Dict) -> str:
+    """Stable hash of a product record, ignoring per-capture fields"""
+    stable = {key: value for key, value in record.items() if key not in VOLATILE_FIELDS}
+    payload = json.dumps(stable, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _delta(new, old):
+    if new is None or old is None:
+        return None
+    return new - old
+
+
+class ProductStore:
+    """SQLite-backed product snapshot store with change detection
+
+    Records are buffered and upserted in batches inside a single
+    transaction. A record whose content hash matches the stored snapshot is
+    skipped; otherwise the snapshot is replaced, and a row is appended to
+    `product_changes` when price, stock or sold count moved.
+
+    With an ImageIndex (see ImageIndex.for_store), image hashes are stored
+    as ids and the index file is flushed before each batch commits.
+
+    The store exposes the same write/flush/close interface as the output
+    sinks, so it can be passed anywhere a sink is expected.
+    """
+
+    def __init__(self, db_path: str = "shopee_products.db", batch_size: int = 500,
+                 image_index: Optional["ImageIndex"] = None):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        # Stored records hold interned `image_ids` instead of image hash lists
+        self.image_index = image_index
+        self.records_written = 0
+        self.records_unchanged = 0
+        self.changes_appended = 0
+        self._buffer: List[Dict] = []
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        for table, column, statement in MIGRATIONS:
+            columns = [row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")]
+            if column not in columns:
+                self._conn.execute(statement)
+        self._conn.executescript(POST_MIGRATION_SCHEMA)
+
+    def write(self, record):
+        """Buffer one record, upserting when the batch is full"""
+        with self._lock:
+            self._buffer.append(record_to_dict(record))
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def write_many(self, records: Iterable):
+        """Buffer several records, upserting as batches fill up"""
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """Upsert any buffered records"""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """Flush remaining records and close the database"""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._flush_locked()
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def upsert_many(self, records: Iterable) -> Tuple[int, int]:
+        """Upsert records immediately, returning (written, unchanged) counts"""
+        with self._lock:
+            return self._upsert_batch([record_to_dict(record) for record in records])
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        with metrics.timer('store_upsert'):
+            self._upsert_batch(batch)
+
+    def _upsert_batch(self, batch: List[Dict]) -> Tuple[int, int]:
+        written = unchanged = 0
+        snapshots = {}
+        changes = []
+
+        with self._conn:
+            # Every snapshot written by this batch shares one sequence number,
+            # so readers can load just the rows changed since their last read
+            update_seq = self._conn.execute(
+                "SELECT COALESCE(MAX(update_seq), 0) + 1 FROM products"
+            ).fetchone()[0]
+
+            for record in batch:
+                shop_id = record.get('shop_id')
+                product_id = record.get('product_id')
+                if shop_id is None or product_id is None:
+                    continue
+
+                if self.image_index is not None and 'images' in record:
+                    record = dict(record)
+                    record['image_ids'] = self.image_index.encode(record.pop('images')).tolist()
+
+                record_hash = content_hash(record)
+                seen_at = record.get('extracted_at') or datetime.now().isoformat()
+                key = (shop_id, product_id)
+                if key in snapshots:
+                    # Same product captured twice in one batch: compare against the pending snapshot
+                    pending = snapshots[key]
+                    row = (pending[2], pending[3])
+                else:
+                    row = self._conn.execute(
+                        "SELECT content_hash, record FROM products WHERE shop_id = ? AND product_id = ?",
+                        key
+                    ).fetchone()
+
+                if row is not None and row[0] == record_hash:
+                    unchanged += 1
+                    continue
+
+                previous = json.loads(row[1]) if row is not None else {}
+                current = [record.get(field) for field in TRACKED_FIELDS]
+                old = [previous.get(field) for field in TRACKED_FIELDS]
+                if row is None or current != old:
+                    changes.append((
+                        shop_id, product_id, seen_at, *current,
+                        *(_delta(new, prev) for new, prev in zip(current, old))
+                    ))
+
+                snapshots[key] = (
+                    shop_id, product_id, record_hash,
+                    json.dumps(record, ensure_ascii=False), seen_at, seen_at, update_seq
+                )
+                written += 1
+
+            if self.image_index is not None:
+                # Ids referenced by this batch must be on disk before it commits
+                self.image_index.flush()
+
+            self._conn.executemany(
+                """
+                INSERT INTO products (
+                    shop_id, product_id, content_hash, record, first_seen, last_seen, update_seq
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (shop_id, product_id) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    record = excluded.record,
+                    last_seen = excluded.last_seen,
+                    update_seq = excluded.update_seq
+                """,
+                snapshots.values()
+            )
+            self._conn.executemany(
+                """
+                INSERT INTO product_changes (
+                    shop_id, product_id, observed_at, price, stock, sold_count,
+                    price_delta, stock_delta, sold_count_delta
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                changes
+            )
+
+        self.records_written += written
+        self.records_unchanged += unchanged
+        self.changes_appended += len(changes)
+        return written, unchanged
+
+    def get(self, shop_id: int, product_id: int) -> Optional[Dict]:
+        """Return the latest stored snapshot for a product"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM products WHERE shop_id = ? AND product_id = ?",
+                (shop_id, product_id)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_changes(self, since_change_id: int = 0, page_size: int = 10_000) -> Iterator[Dict]:
+        """Yield change-log rows appended after `since_change_id`, oldest first"""
+        while True:
+            with self._lock:
+                cursor = self._conn.execute(
+                    """
+                    SELECT change_id, shop_id, product_id, observed_at, price, stock, sold_count,
+                           price_delta, stock_delta, sold_count_delta
+                    FROM product_changes WHERE change_id > ? ORDER BY change_id LIMIT ?
+                    """,
+                    (since_change_id, page_size)
+                )
+                columns = [description[0] for description in cursor.description]
+                rows = cursor.fetchall()
+
+            for row in rows:
+                yield dict(zip(columns, row))
+
+            if len(rows) < page_size:
+                return
+            since_change_id = rows[-1][0]
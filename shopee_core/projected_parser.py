@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Field-Projected Parsing of Shopee Product Payloads
+Decodes only the requested members of the `item` object and skips everything else
+"""
+
+import json
+import re
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+# Fields ShopeeDataProcessor reads from `item`
+DEFAULT_ITEM_FIELDS = (
+    'itemid', 'shopid', 'name', 'price', 'stock', 'item_rating', 'sold', 'description', 'images',
+)
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SCALAR = re.compile(r'[^,}\]\s]+')
+
+_decoder = json.JSONDecoder()
+
+
+class RawJSON:
+    """Undecoded JSON text of a deferred value, decoded on load()"""
+
+    __slots__ = ('text',)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def load(self):
+        return json.loads(self.text)
+
+    def __repr__(self) -> str:
+        return f"RawJSON({len(self.text)} chars)"
+
+
+def _skip_string(s: str, pos: int) -> int:
+    """Return the index just past the JSON string whose opening quote is at `pos`"""
+    end = s.find('"', pos + 1)
+    while end >= 0:
+        # A quote preceded by an odd number of backslashes is escaped
+        backslashes = 0
+        while s[end - 1 - backslashes] == '\\':
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return end + 1
+        end = s.find('"', end + 1)
+    raise ValueError("Unterminated JSON string")
+
+
+def _skip_value(s: str, pos: int) -> int:
+    """Return the index just past the JSON value starting at `pos`
+
+    Strings and scalars are skipped without decoding. Containers are
+    decoded by the C scanner and discarded: a depth-tracking skip in Python,
+    or a bounded-depth regex, measured slower than building the subtree.
+    """
+    char = s[pos]
+    if char == '"':
+        return _skip_string(s, pos)
+    if char in '{[':
+        return _decoder.raw_decode(s, pos)[1]
+    return _SCALAR.match(s, pos).end()
+
+
+def _walk_object(s: str, pos: int, handlers: Dict[str, Callable[[str, int], Optional[int]]]) -> Optional[int]:
+    """Visit the members of the object whose '{' is at `pos`
+
+    A member with a handler is passed to it as handler(key, value index); the
+    handler returns the index just past the value, or None to stop the
+    walk. Other values are skipped. Returns the index just past the
+    closing '}', or None if a handler stopped the walk.
+    """
+    pos = _WHITESPACE.match(s, pos + 1).end()
+    if s[pos] == '}':
+        return pos + 1
+
+    while True:
+        key_match = _STRING.match(s, pos)
+        if key_match is None:
+            raise ValueError(f"Expected object key at {pos}")
+        key = key_match.group()
+        key = json.loads(key) if '\\' in key else key[1:-1]
+
+        pos = _WHITESPACE.match(s, key_match.end()).end()
+        if s[pos] != ':':
+            raise ValueError(f"Expected ':' at {pos}")
+        pos = _WHITESPACE.match(s, pos + 1).end()
+
+        handler = handlers.get(key)
+        if handler is None:
+            pos = _skip_value(s, pos)
+        else:
+            pos = handler(key, pos)
+            if pos is None:
+                return None
+
+        pos = _WHITESPACE.match(s, pos).end()
+        if s[pos] == '}':
+            return pos + 1
+        if s[pos] != ',':
+            raise ValueError(f"Expected ',' or '}}' at {pos}")
+        pos = _WHITESPACE.match(s, pos + 1).end()
+
+
+def _parse_object_members(s: str, pos: int, fields: frozenset, deferred: frozenset) -> Tuple[Dict, int]:
+    """Parse the object whose '{' is at `pos`, keeping only projected members
+
+    Returns the projected dict and the index just past the object.
+    """
+    result = {}
+
+    def keep(key: str, pos: int) -> int:
+        result[key], end = _decoder.raw_decode(s, pos)
+        return end
+
+    def defer(key: str, pos: int) -> int:
+        end = _skip_value(s, pos)
+        result[key] = RawJSON(s[pos:end])
+        return end
+
+    handlers = dict.fromkeys(fields, keep)
+    handlers.update(dict.fromkeys(deferred, defer))
+    return result, _walk_object(s, pos, handlers)
+
+
+def parse_item_projection(payload: Union[str, bytes, bytearray],
+                          fields: Iterable[str] = DEFAULT_ITEM_FIELDS,
+                          defer: Iterable[str] = (),
+                          start: int = 0) -> Optional[Dict]:
+    """Return the projected `item` object of a payload, or None if it has none
+
+    The payload is the JSON object starting at `start`. Its `item` is found
+    where a full parse looks for it: `data.item` when the root has a `data`
+    object, otherwise the root's own `item`. `item` objects inside sibling
+    sections (recommendations, reviews, ...) are skipped with them.
+
+    Only members named in `fields` are decoded. Members named in `defer`
+    are kept as RawJSON and decoded on demand. Unrequested string and
+    scalar values are skipped without decoding. Falls back to a full parse
+    if the payload cannot be scanned.
+    """
+    if not isinstance(payload, str):
+        payload = bytes(payload).decode('utf-8')
+
+    fields = frozenset(fields)
+    deferred = frozenset(defer)
+    found = {}
+
+    def parse_item(key: str, pos: int) -> int:
+        if payload[pos] != '{':
+            found[key] = None
+            return _skip_value(payload, pos)
+        found[key], end = _parse_object_members(payload, pos, fields, deferred)
+        return end
+
+    def parse_data_item(key: str, pos: int) -> None:
+        parse_item('data_item', pos)
+        # The product is the first `item` of `data`; nothing after it matters
+        return None
+
+    def enter_data(key: str, pos: int) -> Optional[int]:
+        if payload[pos] != '{':
+            return _skip_value(payload, pos)
+        # A `data` object decides the result, even without an `item`
+        found['data_item'] = None
+        _walk_object(payload, pos, {'item': parse_data_item})
+        return None
+
+    try:
+        start = _WHITESPACE.match(payload, start).end()
+        if payload[start] != '{':
+            return None
+        _walk_object(payload, start, {'item': parse_item, 'data': enter_data})
+    except (ValueError, IndexError, AttributeError):
+        return _full_parse_fallback(payload, fields, deferred, start)
+    return found['data_item'] if 'data_item' in found else found.get('item')
+
+
+def _full_parse_fallback(payload: str, fields: frozenset, deferred: frozenset, start: int) -> Optional[Dict]:
+    data, _ = _decoder.raw_decode(payload, payload.index('{', start))
+    if not isinstance(data, dict):
+        return None
+    if isinstance(data.get('data'), dict):
+        data = data['data']
+    item = data.get('item')
+    if not isinstance(item, dict):
+        return None
+
+    projected = {}
+    for key, value in item.items():
+        if key in deferred:
+            projected[key] = RawJSON(json.dumps(value, ensure_ascii=False))
+        elif key in fields:
+            projected[key] = value
+    return projected
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Vectorized Product Reports
+Loads the ProductStore column-wise into NumPy arrays and computes per-shop aggregates
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import quote
+
+import numpy as np
+
+# Rating band edges: [0, 1), [1, 2), ... [4, 5]
+DEFAULT_RATING_BANDS = (0.0, 1.0, 2.0, 3.0, 4.0, 5.0)
+
+# Price quantiles reported per shop
+PRICE_QUANTILES = (0.25, 0.5, 0.75)
+
+_COLUMNS_QUERY = """
+SELECT shop_id, product_id,
+       json_extract(record, '$.price'),
+       json_extract(record, '$.stock'),
+       json_extract(record, '$.sold_count'),
+       json_extract(record, '$.rating'),
+       update_seq
+FROM products WHERE update_seq > ?
+"""
+
+
+class ProductReport:
+    """Column-wise view of the latest product snapshots with group-by-shop aggregates
+
+    refresh() loads only snapshots written since the previous refresh (using
+    the store's update_seq), overwriting rows for products already loaded
+    and appending new ones. Fields are extracted by SQLite's json_extract,
+    so no records are parsed in Python. Missing numeric values are NaN.
+    """
+
+    def __init__(self, db_path: str = "shopee_products.db"):
+        self.db_path = db_path
+        self.shop_id = np.empty(0, dtype=np.int64)
+        self.product_id = np.empty(0, dtype=np.int64)
+        self.price = np.empty(0, dtype=np.float64)
+        self.stock = np.empty(0, dtype=np.float64)
+        self.sold_count = np.empty(0, dtype=np.float64)
+        self.rating = np.empty(0, dtype=np.float64)
+        self.last_seq = 0
+        self._positions: Dict[tuple, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.shop_id)
+
+    def refresh(self) -> int:
+        """Load snapshots changed since the last refresh, returning how many were read
+
+        The store is opened read-only, so a wrong path raises
+        sqlite3.OperationalError instead of creating an empty database.
+        """
+        conn = sqlite3.connect(f"file:{quote(os.path.abspath(self.db_path))}?mode=ro", uri=True)
+        try:
+            rows = conn.execute(_COLUMNS_QUERY, (self.last_seq,)).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            return 0
+
+        # None -> NaN happens in the float conversion
+        batch = np.array(rows, dtype=np.float64)
+        shop_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        product_ids = np.array([row[1] for row in rows], dtype=np.int64)
+
+        positions = self._positions
+        targets = np.fromiter(
+            (positions.get(key, -1) for key in zip(shop_ids.tolist(), product_ids.tolist())),
+            dtype=np.int64, count=len(rows)
+        )
+        is_new = targets < 0
+
+        # Assign positions to products seen for the first time, in load order
+        first_new = len(self.shop_id)
+        new_count = int(is_new.sum())
+        targets[is_new] = np.arange(first_new, first_new + new_count)
+        for key, position in zip(zip(shop_ids[is_new].tolist(), product_ids[is_new].tolist()),
+                                 targets[is_new].tolist()):
+            positions[key] = position
+
+        self.shop_id = np.concatenate((self.shop_id, shop_ids[is_new]))
+        self.product_id = np.concatenate((self.product_id, product_ids[is_new]))
+        for column, values in (('price', batch[:, 2]), ('stock', batch[:, 3]),
+                               ('sold_count', batch[:, 4]), ('rating', batch[:, 5])):
+            array = np.concatenate((getattr(self, column), np.full(new_count, np.nan)))
+            array[targets] = values
+            setattr(self, column, array)
+
+        self.last_seq = int(batch[:, 6].max())
+        return len(rows)
+
+    def shop_summary(self, rating_bands: Sequence[float] = DEFAULT_RATING_BANDS) -> Dict[str, np.ndarray]:
+        """Per-shop aggregates as parallel arrays, ordered by shop_id"""
+        shops, group = np.unique(self.shop_id, return_inverse=True)
+        shop_count = len(shops)
+        summary: Dict[str, np.ndarray] = {
+            'shop_id': shops,
+            'products': np.bincount(group, minlength=shop_count),
+        }
+        if shop_count == 0:
+            return self._empty_summary(summary, rating_bands)
+
+        # Price distribution: sort by (shop, price) with NaN last within each shop
+        has_price = ~np.isnan(self.price)
+        priced = np.bincount(group, weights=has_price, minlength=shop_count).astype(np.int64)
+        order = np.lexsort((self.price, group))
+        sorted_price = self.price[order]
+        group_start = np.concatenate(([0], np.cumsum(summary['products'])[:-1]))
+        safe = priced > 0
+
+        summary['priced'] = priced
+        summary['price_min'] = np.where(safe, sorted_price[group_start], np.nan)
+        summary['price_max'] = np.where(
+            safe, sorted_price[group_start + np.maximum(priced - 1, 0)], np.nan
+        )
+        price_sum = np.bincount(group, weights=np.where(has_price, self.price, 0.0), minlength=shop_count)
+        summary['price_mean'] = np.divide(price_sum, priced, out=np.full(shop_count, np.nan), where=safe)
+        for quantile in PRICE_QUANTILES:
+            offset = np.floor(quantile * np.maximum(priced - 1, 0)).astype(np.int64)
+            summary[f'price_p{int(quantile * 100)}'] = np.where(safe, sorted_price[group_start + offset], np.nan)
+
+        summary['stock_out'] = np.bincount(group, weights=self.stock == 0, minlength=shop_count).astype(np.int64)
+        summary['sold_total'] = np.bincount(
+            group, weights=np.nan_to_num(self.sold_count), minlength=shop_count
+        ).astype(np.int64)
+
+        # Rating bands: one column per band, unrated products counted separately
+        edges = np.asarray(rating_bands, dtype=np.float64)
+        rated = ~np.isnan(self.rating)
+        band = np.clip(np.searchsorted(edges, self.rating[rated], side='right') - 1, 0, len(edges) - 2)
+        counts = np.bincount(
+            group[rated] * (len(edges) - 1) + band, minlength=shop_count * (len(edges) - 1)
+        ).reshape(shop_count, len(edges) - 1)
+        for index in range(len(edges) - 1):
+            summary[f'rating_{edges[index]:g}_{edges[index + 1]:g}'] = counts[:, index]
+        summary['unrated'] = np.bincount(group, weights=~rated, minlength=shop_count).astype(np.int64)
+
+        return summary
+
+    @staticmethod
+    def _empty_summary(summary: Dict[str, np.ndarray], rating_bands: Sequence[float]) -> Dict[str, np.ndarray]:
+        """Zero-length columns in the same order and dtypes as a populated summary"""
+        edges = np.asarray(rating_bands, dtype=np.float64)
+        empty_int = np.empty(0, dtype=np.int64)
+        empty_float = np.empty(0, dtype=np.float64)
+
+        summary['priced'] = empty_int
+        for column in ('price_min', 'price_max', 'price_mean'):
+            summary[column] = empty_float
+        for quantile in PRICE_QUANTILES:
+            summary[f'price_p{int(quantile * 100)}'] = empty_float
+        summary['stock_out'] = empty_int
+        summary['sold_total'] = empty_int
+        for index in range(len(edges) - 1):
+            summary[f'rating_{edges[index]:g}_{edges[index + 1]:g}'] = empty_int
+        summary['unrated'] = empty_int
+        return summary
+
+
+def summary_rows(summary: Dict[str, np.ndarray]) -> List[Dict]:
+    """Convert a shop summary into one JSON-friendly dict per shop"""
+    columns = list(summary)
+    values = [summary[column].tolist() for column in columns]
+    rows = []
+    for row in zip(*values):
+        rows.append({
+            column: (None if isinstance(value, float) and value != value else value)
+            for column, value in zip(columns, row)
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Per-shop report over a ProductStore database")
+    parser.add_argument('db_path', nargs='?', default="shopee_products.db")
+    parser.add_argument('--json', action='store_true', help="emit one JSON object per shop")
+    args = parser.parse_args(argv)
+
+    report = ProductReport(args.db_path)
+    try:
+        report.refresh()
+    except sqlite3.Error as e:
+        print(f"Error reading product store {args.db_path}: {e}", file=sys.stderr)
+        return 1
+    rows = summary_rows(report.shop_summary())
+
+    if args.json:
+        for row in rows:
+            print(json.dumps(row))
+        return 0
+
+    print(f"{'shop_id':>12} {'products':>9} {'price_min':>12} {'price_p50':>12} "
+          f"{'price_max':>12} {'stock_out':>10} {'sold_total':>11}")
+    for row in rows:
+        print(f"{row['shop_id']:>12} {row['products']:>9} {row['price_min'] or 0:>12.0f} "
+              f"{row['price_p50'] or 0:>12.0f} {row['price_max'] or 0:>12.0f} "
+              f"{row['stock_out']:>10} {row['sold_total']:>11}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Offline Multi-Process Reprocessing of Archived Captures
+Re-runs ShopeeDataProcessor over a ResponseArchive or recorded logcat files across a process pool
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .output_sinks import SINK_TYPES, open_sink
+from .processor import SHOPEE_API_PREFIX, ShopeeDataProcessor
+from .response_archive import ResponseArchive
+
+
+# Files written by the merge step (any sink format, including part files)
+_MERGED_FILE = re.compile(r"products-\d+\.")
+
+
+class Shard:
+    """One unit of work: a slice of the archive index or one logcat file"""
+
+    def __init__(self, index: int, source: str, entries: Optional[List[Tuple[str, str, str]]] = None,
+                 identity: Optional[Dict] = None):
+        self.index = index
+        # Archive root or logcat file path
+        self.source = source
+        # (digest, url, timestamp) for archive shards, None for logcat shards
+        self.entries = entries
+        # What the shard was planned from; a .done marker only counts if it matches
+        self.identity = identity or {}
+
+    @property
+    def name(self) -> str:
+        return f"shard-{self.index:05d}"
+
+    @property
+    def size(self) -> int:
+        return len(self.entries) if self.entries is not None else 1
+
+
+def plan_archive_shards(archive_root: str, shard_size: int, url_contains: Optional[str] = None) -> List[Shard]:
+    """Split the archive index into fixed-size shards in capture order
+
+    Shard boundaries depend only on index position, so they are stable
+    while the index keeps growing and completed shards stay valid.
+    """
+    shards = []
+    entries = []
+
+    def add_shard():
+        identity = {
+            'url_contains': url_contains,
+            'shard_size': shard_size,
+            'first': entries[0][0],
+            'last': entries[-1][0],
+        }
+        shards.append(Shard(len(shards), archive_root, entries, identity))
+
+    for entry in ResponseArchive(archive_root).iter_index(url_contains):
+        entries.append((entry['digest'], entry['url'], entry['timestamp']))
+        if len(entries) == shard_size:
+            add_shard()
+            entries = []
+    if entries:
+        add_shard()
+    return shards
+
+
+def plan_logcat_shards(paths: List[str]) -> List[Shard]:
+    """One shard per recorded logcat file, in the order given"""
+    shards = []
+    for index, path in enumerate(paths):
+        stat = os.stat(path)
+        identity = {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        shards.append(Shard(index, path, identity=identity))
+    return shards
+
+
+def _iter_shard_records(shard: Shard, processor: ShopeeDataProcessor) -> Iterator[Dict]:
+    if shard.entries is not None:
+        archive = ResponseArchive(shard.source)
+        for digest, url, timestamp in shard.entries:
+            record = processor.process_api_body(archive.get(digest))
+            if record:
+                # Use the capture time so reruns of an archive produce identical output
+                record['extracted_at'] = timestamp
+                record['source_url'] = url
+                yield record
+        return
+
+    # Logcat lines carry no year, so these records keep the extraction time
+    with open(shard.source, 'r', encoding='utf-8', errors='replace') as f:
+        api_lines = (line for line in f if SHOPEE_API_PREFIX in line)
+        yield from processor.iter_mobile_api_responses(api_lines)
+
+
+def reprocess_shard(shard: Shard, work_dir: str, processor_options: Dict) -> Tuple[int, int]:
+    """Process one shard into `<work_dir>/<shard>.jsonl`, returning (shard index, records)
+
+    Output is written to a .part file and renamed into place, then a .done
+    marker records the shard's identity; both make reruns resumable.
+    """
+    processor = ShopeeDataProcessor(**processor_options)
+    out_path = os.path.join(work_dir, shard.name + ".jsonl")
+    records = 0
+
+    with open(out_path + ".part", 'w', encoding='utf-8') as f:
+        for record in _iter_shard_records(shard, processor):
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            records += 1
+    os.replace(out_path + ".part", out_path)
+
+    with open(os.path.join(work_dir, shard.name + ".done"), 'w', encoding='utf-8') as f:
+        json.dump({'identity': shard.identity, 'inputs': shard.size, 'records': records}, f)
+
+    return shard.index, records
+
+
+def _shard_is_done(shard: Shard, work_dir: str) -> bool:
+    marker = os.path.join(work_dir, shard.name + ".done")
+    if not os.path.exists(marker):
+        return False
+    with open(marker, 'r', encoding='utf-8') as f:
+        marker_data = json.load(f)
+    # A shard planned from another file, filter or slice, or a trailing shard
+    # that has grown since it was processed, must be redone
+    return marker_data.get('identity') == shard.identity and marker_data.get('inputs') == shard.size
+
+
+def _replace_merged_output(staging_dir: str, output_dir: str):
+    """Move a finished merge into output_dir, removing files left by earlier merges
+
+    Files are renamed one at a time; if that is interrupted, rerunning
+    reprocess rebuilds the merge from the completed shards.
+    """
+    merged = sorted(os.listdir(staging_dir))
+    for name in merged:
+        os.replace(os.path.join(staging_dir, name), os.path.join(output_dir, name))
+    for name in os.listdir(output_dir):
+        if _MERGED_FILE.match(name) and name not in merged:
+            os.remove(os.path.join(output_dir, name))
+    os.rmdir(staging_dir)
+
+
+def run_reprocess(shards: List[Shard], output_dir: str, work_dir: str, sink_kind: str = 'jsonl',
+                  workers: Optional[int] = None, processor_options: Optional[Dict] = None) -> int:
+    """Process all shards in parallel, then merge them in shard order into a sink
+
+    Returns the number of records written.
+    """
+    # Imported here so planning shards or importing the module stays cheap
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    processor_options = processor_options or {}
+    os.makedirs(work_dir, exist_ok=True)
+
+    pending = [shard for shard in shards if not _shard_is_done(shard, work_dir)]
+    total = len(shards)
+    completed = total - len(pending)
+    if completed:
+        print(f"Resuming: {completed}/{total} shards already done")
+
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(reprocess_shard, shard, work_dir, processor_options) for shard in pending]
+        for future in as_completed(futures):
+            shard_index, records = future.result()
+            completed += 1
+            elapsed = time.time() - start
+            print(f"[{completed}/{total}] shard {shard_index:05d}: {records} records ({elapsed:.1f}s)")
+
+    # Merge in shard order so output is identical regardless of completion order.
+    # The merge goes to a staging directory and then replaces the previous
+    # merge, so reruns into the same output do not duplicate records
+    staging_dir = os.path.join(output_dir, ".merge")
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    with open_sink(sink_kind, staging_dir, basename='products') as sink:
+        for shard in shards:
+            with open(os.path.join(work_dir, shard.name + ".jsonl"), 'r', encoding='utf-8') as f:
+                for line in f:
+                    sink.write(json.loads(line))
+    _replace_merged_output(staging_dir, output_dir)
+
+    print(f"Reprocessing completed! Wrote {sink.records_written} products to {output_dir}")
+    return sink.records_written
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Re-extract products from archived captures")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--archive', help="ResponseArchive root directory")
+    source.add_argument('--logcat', nargs='+', help="recorded logcat files (one shard each)")
+    parser.add_argument('--output', required=True, help="output directory for the merged sink")
+    parser.add_argument('--work-dir', help="shard output/resume directory (default: <output>/.shards)")
+    parser.add_argument('--format', default='jsonl', choices=sorted(SINK_TYPES))
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--shard-size', type=int, default=1000, help="archive entries per shard")
+    parser.add_argument('--url-contains', default="shopee.tw/api/v4/pdp/get_pc")
+    args = parser.parse_args(argv)
+
+    if args.archive:
+        shards = plan_archive_shards(args.archive, args.shard_size, args.url_contains)
+    else:
+        shards = plan_logcat_shards(args.logcat)
+
+    if not shards:
+        print("Nothing to reprocess")
+        return 1
+
+    work_dir = args.work_dir or os.path.join(args.output, ".shards")
+    run_reprocess(shards, args.output, work_dir, args.format, args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Raw Response Archive
+Stores compressed API bodies by digest with an append-only index for offline reprocessing
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from .body_codec import BodyBuffer, as_bytes
+
+
+class ResponseArchive:
+    """Append-only archive of raw response bodies
+
+    Layout under `root`:
+        objects/ab/cdef...   zlib-compressed body, named by its BLAKE2b digest
+        index.jsonl          one {"digest", "url", "timestamp", "size"} line per capture
+
+    Identical bodies are stored once; every capture still gets an index
+    line, so the archive records when and where each body was seen.
+    """
+
+    def __init__(self, root: str = "shopee_raw_archive", compresslevel: int = 6):
+        self.root = root
+        self.compresslevel = compresslevel
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "index.jsonl")
+        self._lock = threading.Lock()
+
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    @staticmethod
+    def digest(body: BodyBuffer) -> str:
+        """Content address of a body"""
+        return hashlib.blake2b(body, digest_size=20).hexdigest()
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def put(self, body: Union[str, BodyBuffer], url: str, timestamp: Optional[str] = None) -> str:
+        """Archive one body and index it under url/timestamp, returning its digest
+
+        Bytes and memoryviews are hashed and compressed in place; only str
+        bodies are encoded first.
+        """
+        body = as_bytes(body)
+
+        digest = self.digest(body)
+        path = self._object_path(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file in the same directory so the rename is atomic
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zlib.compress(body, self.compresslevel))
+            os.replace(tmp_path, path)
+
+        entry = {
+            'digest': digest,
+            'url': url,
+            'timestamp': timestamp or datetime.now().isoformat(),
+            'size': memoryview(body).nbytes,
+        }
+        with self._lock:
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Return the raw body stored under a digest"""
+        with open(self._object_path(digest), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def __contains__(self, digest: str) -> bool:
+        return os.path.exists(self._object_path(digest))
+
+    def iter_index(self, url_contains: Optional[str] = None) -> Iterator[Dict]:
+        """Yield index entries in capture order, optionally filtered by URL substring"""
+        if not os.path.exists(self.index_path):
+            return
+
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a truncated last line
+                    continue
+                if url_contains and url_contains not in entry['url']:
+                    continue
+                yield entry
+
+    def iter_bodies(self, url_contains: Optional[str] = None) -> Iterator[Tuple[Dict, bytes]]:
+        """Yield (entry, body) pairs for every indexed capture"""
+        for entry in self.iter_index(url_contains):
+            yield entry, self.get(entry['digest'])
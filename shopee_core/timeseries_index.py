@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Array-Backed Price/Stock Time-Series Index
+Append-only, memory-mapped per-item history with range queries and vectorized aggregates
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple, Union
+
+import numpy as np
+
+from .output_sinks import record_to_dict
+
+POINT_DTYPE = np.dtype([
+    ('shop_id', '<i8'),
+    ('product_id', '<i8'),
+    ('ts', '<f8'),
+    ('price', '<i8'),
+    ('stock', '<i8'),
+    ('sold_count', '<i8'),
+])
+
+KEY_DTYPE = np.dtype([
+    ('shop_id', '<i8'),
+    ('product_id', '<i8'),
+    ('start', '<i8'),
+    ('stop', '<i8'),
+])
+
+VALUE_FIELDS = ('price', 'stock', 'sold_count')
+
+# Stored in place of a missing price/stock/sold value
+MISSING = np.iinfo(np.int64).min
+
+Timestamp = Union[str, float, datetime, None]
+
+
+def _to_epoch(value: Timestamp) -> float:
+    if value is None:
+        return datetime.now().timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return datetime.fromisoformat(value).timestamp()
+
+
+class TimeSeriesIndex:
+    """Append-only price/stock/sold history keyed by (shop_id, product_id)
+
+    Layout under `root`:
+        points.bin   raw POINT_DTYPE rows in arrival order (memory-mapped for reads)
+        order.npy    row numbers sorted by (shop_id, product_id, ts)
+        keys.npy     one KEY_DTYPE row per item, sorted: its [start, stop) slice of order.npy
+        index.json   number of points covered by order.npy/keys.npy
+
+    Appends only touch points.bin. Rows past the persisted index form a
+    tail that is sorted in memory on its own; a query binary-searches the
+    item in keys.npy and in the tail and merges the two slices. Once the
+    tail outgrows `tail_ratio` of the index (and at least `min_tail_rows`)
+    the full index is rebuilt with a vectorized lexsort, so rebuild cost is
+    amortized over many appends.
+
+    Records are the product dicts from ShopeeDataProcessor (timestamp in
+    `extracted_at`) or ProductStore change rows (`observed_at`). The index
+    follows the sink write/flush/close interface.
+    """
+
+    def __init__(self, root: str = "shopee_timeseries", batch_size: int = 10_000,
+                 tail_ratio: float = 0.1, min_tail_rows: int = 100_000):
+        self.root = root
+        self.batch_size = batch_size
+        self.tail_ratio = tail_ratio
+        self.min_tail_rows = min_tail_rows
+        self.points_path = os.path.join(root, "points.bin")
+        self._meta_path = os.path.join(root, "index.json")
+        self._order_path = os.path.join(root, "order.npy")
+        self._keys_path = os.path.join(root, "keys.npy")
+        self._buffer: List[Tuple] = []
+        self._lock = threading.Lock()
+        self._loaded_rows = -1
+        self._points = None
+        # Persisted index: rows it covers, sorted row numbers and per-item key columns
+        self._index_rows = -1
+        self._order = None
+        self._key_shop = self._key_product = self._key_start = self._key_stop = None
+        # Tail past the persisted index: row numbers and key columns, sorted
+        self._tail_order = self._tail_shop = self._tail_product = None
+
+        os.makedirs(root, exist_ok=True)
+
+    # -- writing ---------------------------------------------------------
+
+    def write(self, record):
+        """Buffer one record, appending to disk when the batch is full"""
+        record = record_to_dict(record)
+        if record.get('shop_id') is None or record.get('product_id') is None:
+            return
+
+        row = (
+            record['shop_id'],
+            record['product_id'],
+            _to_epoch(record.get('extracted_at') or record.get('observed_at')),
+            *(MISSING if record.get(field) is None else record[field] for field in VALUE_FIELDS),
+        )
+        with self._lock:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.batch_size:
+                self._flush_locked()
+
+    def write_many(self, records: Iterable):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        batch = np.array(self._buffer, dtype=POINT_DTYPE)
+        self._buffer = []
+        with open(self.points_path, 'ab') as f:
+            f.write(batch.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    # -- indexing --------------------------------------------------------
+
+    def __len__(self) -> int:
+        if not os.path.exists(self.points_path):
+            return 0
+        return os.path.getsize(self.points_path) // POINT_DTYPE.itemsize
+
+    def _load_points(self, rows: int) -> np.ndarray:
+        if rows == 0:
+            return np.empty(0, dtype=POINT_DTYPE)
+        return np.memmap(self.points_path, dtype=POINT_DTYPE, mode='r', shape=(rows,))
+
+    def _persisted_rows(self) -> int:
+        """Rows covered by the persisted index, or 0 if it is missing or inconsistent
+
+        order.npy and keys.npy are replaced before index.json, so a crash in
+        between leaves metadata that disagrees with the arrays. Such an index
+        is treated as absent, which puts every row in the tail until it is
+        rebuilt, instead of serving rows from both the index and the tail.
+        """
+        if not os.path.exists(self._meta_path):
+            return 0
+        with open(self._meta_path, 'r', encoding='utf-8') as f:
+            rows = json.load(f)['rows']
+        try:
+            order = np.load(self._order_path, mmap_mode='r')
+            keys = np.load(self._keys_path, mmap_mode='r')
+        except (OSError, ValueError):
+            return 0
+        covered = int(keys['stop'][-1]) if len(keys) else 0
+        if len(order) != rows or covered != rows:
+            return 0
+        return rows
+
+    def _ensure_index(self):
+        """Bring the persisted index and the sorted tail up to date with points.bin"""
+        with self._lock:
+            self._flush_locked()
+            rows = len(self)
+            if rows == self._loaded_rows:
+                return
+
+            indexed = self._persisted_rows()
+            if indexed > rows:
+                indexed = 0
+            if rows - indexed > max(self.min_tail_rows, self.tail_ratio * indexed):
+                self._write_index(self._load_points(rows))
+                indexed = rows
+            if indexed != self._index_rows:
+                self._load_index(indexed)
+
+            points = self._load_points(rows)
+            tail = points[indexed:rows]
+            tail_order = np.lexsort((tail['ts'], tail['product_id'], tail['shop_id']))
+            self._tail_shop = tail['shop_id'][tail_order]
+            self._tail_product = tail['product_id'][tail_order]
+            self._tail_order = tail_order.astype(np.int64) + indexed
+
+            self._points = points
+            self._loaded_rows = rows
+
+    def _write_index(self, points: np.ndarray):
+        order, keys = self._build_index(points)
+        np.save(self._order_path + ".tmp.npy", order)
+        np.save(self._keys_path + ".tmp.npy", keys)
+        os.replace(self._order_path + ".tmp.npy", self._order_path)
+        os.replace(self._keys_path + ".tmp.npy", self._keys_path)
+        with open(self._meta_path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump({'rows': len(points)}, f)
+        os.replace(self._meta_path + ".tmp", self._meta_path)
+
+    def _load_index(self, indexed: int):
+        if indexed == 0:
+            order, keys = self._build_index(self._load_points(0))
+        else:
+            order = np.load(self._order_path, mmap_mode='r')
+            keys = np.load(self._keys_path)
+        self._order = order
+        # Contiguous columns so searchsorted does not copy them per query
+        self._key_shop = np.ascontiguousarray(keys['shop_id'])
+        self._key_product = np.ascontiguousarray(keys['product_id'])
+        self._key_start = np.ascontiguousarray(keys['start'])
+        self._key_stop = np.ascontiguousarray(keys['stop'])
+        self._index_rows = indexed
+
+    @staticmethod
+    def _key_range(shop_ids: np.ndarray, product_ids: np.ndarray,
+                   shop_id: int, product_id: int) -> Tuple[int, int]:
+        """[lo, hi) of (shop_id, product_id) in columns sorted by that pair"""
+        lo = int(np.searchsorted(shop_ids, shop_id, side='left'))
+        hi = int(np.searchsorted(shop_ids, shop_id, side='right'))
+        products = product_ids[lo:hi]
+        return (lo + int(np.searchsorted(products, product_id, side='left')),
+                lo + int(np.searchsorted(products, product_id, side='right')))
+
+    @staticmethod
+    def _build_index(points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if len(points) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=KEY_DTYPE)
+
+        order = np.lexsort((points['ts'], points['product_id'], points['shop_id']))
+        shop_ids = points['shop_id'][order]
+        product_ids = points['product_id'][order]
+
+        # Item boundaries are where either key column changes
+        boundaries = np.flatnonzero(
+            (shop_ids[1:] != shop_ids[:-1]) | (product_ids[1:] != product_ids[:-1])
+        ) + 1
+        starts = np.concatenate(([0], boundaries))
+        stops = np.concatenate((boundaries, [len(order)]))
+
+        keys = np.empty(len(starts), dtype=KEY_DTYPE)
+        keys['shop_id'] = shop_ids[starts]
+        keys['product_id'] = product_ids[starts]
+        keys['start'] = starts
+        keys['stop'] = stops
+        return order.astype(np.int64), keys
+
+    # -- queries ---------------------------------------------------------
+
+    def items(self) -> List[Tuple[int, int]]:
+        """All indexed (shop_id, product_id) keys, sorted"""
+        self._ensure_index()
+        pairs = np.empty(len(self._key_shop) + len(self._tail_shop),
+                         dtype=[('shop_id', '<i8'), ('product_id', '<i8')])
+        pairs['shop_id'] = np.concatenate((self._key_shop, self._tail_shop))
+        pairs['product_id'] = np.concatenate((self._key_product, self._tail_product))
+        return [tuple(pair) for pair in np.unique(pairs).tolist()]
+
+    def history(self, shop_id: int, product_id: int,
+                start: Timestamp = None, end: Timestamp = None) -> np.ndarray:
+        """Points for one item with start <= ts < end, oldest first"""
+        self._ensure_index()
+        lo, hi = self._key_range(self._key_shop, self._key_product, shop_id, product_id)
+        row_numbers = self._order[self._key_start[lo]:self._key_stop[lo]] if hi > lo else None
+        tail_lo, tail_hi = self._key_range(self._tail_shop, self._tail_product, shop_id, product_id)
+        if tail_hi > tail_lo:
+            tail_rows = self._tail_order[tail_lo:tail_hi]
+            row_numbers = tail_rows if row_numbers is None else np.concatenate((row_numbers, tail_rows))
+        if row_numbers is None:
+            return np.empty(0, dtype=POINT_DTYPE)
+
+        rows = self._points[row_numbers]
+        if hi > lo and tail_hi > tail_lo:
+            # Both slices are sorted by ts; the tail may hold older captures
+            rows = rows[np.argsort(rows['ts'], kind='stable')]
+        timestamps = rows['ts']
+        lo = 0 if start is None else np.searchsorted(timestamps, _to_epoch(start), side='left')
+        hi = len(rows) if end is None else np.searchsorted(timestamps, _to_epoch(end), side='left')
+        return rows[lo:hi]
+
+    def aggregate(self, shop_id: int, product_id: int, field: str = 'price',
+                  start: Timestamp = None, end: Timestamp = None) -> Dict:
+        """min/max/mean/first/last of one field over a time window, ignoring missing values"""
+        if field not in VALUE_FIELDS:
+            raise ValueError(f"Unknown field: {field!r} (expected one of {VALUE_FIELDS})")
+
+        rows = self.history(shop_id, product_id, start, end)
+        values = rows[field]
+        present = values != MISSING
+        values = values[present]
+        if len(values) == 0:
+            return {'count': 0}
+
+        timestamps = rows['ts'][present]
+        return {
+            'count': int(len(values)),
+            'min': int(values.min()),
+            'max': int(values.max()),
+            'mean': float(values.mean()),
+            'first': int(values[0]),
+            'last': int(values[-1]),
+            'start': datetime.fromtimestamp(timestamps[0]).isoformat(),
+            'end': datetime.fromtimestamp(timestamps[-1]).isoformat(),
+        }
@@ -0,0 +1,49 @@
+"""
+Shared fixtures for the shopee_core tests
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Tests run from a checkout, so make shopee_core importable
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def make_item(itemid: int = 1001, shopid: int = 77, price: int = 1_500_000, **overrides) -> dict:
+    """A small product item shaped like the get_pc `item` payload"""
+    item = {
+        'itemid': itemid,
+        'shopid': shopid,
+        'name': f"product {itemid}",
+        'price': price,
+        'stock': 12,
+        'sold': 340,
+        'item_rating': {'rating_star': 4.5, 'rating_count': [10, 0, 1, 2, 3, 4]},
+        'description': "line one\nline \"two\"",
+        'images': [{'image': 'aa11'}, {'image': 'bb22'}],
+        'models': [{'modelid': 1, 'name': 'red', 'extinfo': {'item': {'itemid': 0}}}],
+    }
+    item.update(overrides)
+    return item
+
+
+def make_pc_body(**item_overrides) -> str:
+    """A get_pc response body: the item wrapped in a `data` envelope with sibling sections"""
+    return json.dumps({
+        'error': None,
+        'data': {
+            'shop_detailed': {'shopid': item_overrides.get('shopid', 77), 'name': "shop"},
+            'item': make_item(**item_overrides),
+            'ratings': [{'comment': "great", 'item': {'name': "not the product"}}],
+        },
+    }, ensure_ascii=False)
+
+
+@pytest.fixture
+def pc_body() -> str:
+    return make_pc_body()
@@ -0,0 +1,82 @@
+import threading
+import time
+
+from mobile_emulation_template import CaptureQueue, NetworkTrafficCapture
+
+
+def _filled(count: int, maxsize: int = 0) -> CaptureQueue:
+    capture_queue = CaptureQueue(maxsize=maxsize)
+    for n in range(count):
+        capture_queue.put(n)
+    return capture_queue
+
+
+def test_max_items_caps_the_batch():
+    capture_queue = _filled(5)
+
+    assert capture_queue.get_batch(max_items=3) == [0, 1, 2]
+    assert capture_queue.get_batch(max_items=3) == [3, 4]
+    assert capture_queue.get_batch(max_items=3) == []
+
+
+def test_no_limit_drains_everything():
+    capture_queue = _filled(7)
+
+    assert capture_queue.get_batch(max_items=None) == list(range(7))
+    assert capture_queue.empty()
+
+
+def test_max_wait_returns_partial_batch_on_timeout():
+    capture_queue = _filled(2)
+
+    start = time.monotonic()
+    assert capture_queue.get_batch(max_items=10, max_wait=0.05) == [0, 1]
+    assert time.monotonic() - start >= 0.05
+
+
+def test_max_wait_returns_early_once_the_batch_fills():
+    capture_queue = CaptureQueue()
+
+    def produce():
+        for n in range(3):
+            capture_queue.put(n)
+
+    threading.Timer(0.02, produce).start()
+    start = time.monotonic()
+    assert capture_queue.get_batch(max_items=3, max_wait=5.0) == [0, 1, 2]
+    assert time.monotonic() - start < 2.0
+
+
+def test_batch_unblocks_producers_waiting_on_a_full_queue():
+    capture_queue = _filled(2, maxsize=2)
+    done = []
+
+    def produce(n):
+        capture_queue.put(n)
+        done.append(n)
+
+    producers = [threading.Thread(target=produce, args=(n,)) for n in (2, 3)]
+    for producer in producers:
+        producer.start()
+    time.sleep(0.02)
+    assert done == []
+
+    assert capture_queue.get_batch(max_items=None) == [0, 1]
+    for producer in producers:
+        producer.join(timeout=2.0)
+    assert sorted(done) == [2, 3]
+    assert sorted(capture_queue.get_batch(max_items=None)) == [2, 3]
+
+
+def test_iter_captured_batches_stops_after_capture_stops_and_queue_drains():
+    capture = NetworkTrafficCapture()
+    capture.is_capturing = True
+    for n in range(5):
+        capture.capture_queue.put({'log_line': str(n)})
+
+    batches = capture.iter_captured_batches(max_items=2, max_wait=0.01)
+    assert [entry['log_line'] for entry in next(batches)] == ['0', '1']
+
+    capture.stop_traffic_capture()
+    remaining = [entry['log_line'] for batch in batches for entry in batch]
+    assert remaining == ['2', '3', '4']
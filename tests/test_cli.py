@@ -0,0 +1,35 @@
+import json
+import os
+
+import pytest
+
+from shopee_core import cli
+
+
+def _read_products(output_dir):
+    records = []
+    for name in sorted(os.listdir(output_dir)):
+        with open(os.path.join(output_dir, name), 'r', encoding='utf-8') as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+
+@pytest.mark.parametrize('extra_args', [[], ['--projected']])
+def test_extract_get_pc_bodies(tmp_path, pc_body, extra_args):
+    inputs = tmp_path / 'bodies.txt'
+    inputs.write_text(pc_body + '\n{"error": 4, "data": null}\n', encoding='utf-8')
+    output_dir = str(tmp_path / 'out')
+
+    assert cli.main(['extract', str(inputs), '--output', output_dir, *extra_args]) == 0
+
+    records = _read_products(output_dir)
+    assert len(records) == 1
+    assert records[0]['product_id'] == 1001
+    assert records[0]['shop_id'] == 77
+    assert records[0]['name'] == "product 1001"
+    assert records[0]['images'] == ['aa11', 'bb22']
+
+
+def test_unknown_command(capsys):
+    assert cli.main(['nope']) == 2
+    assert "Unknown command" in capsys.readouterr().err
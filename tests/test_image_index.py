@@ -0,0 +1,81 @@
+import json
+import sqlite3
+
+from shopee_core.image_index import ImageIndex
+from shopee_core.output_sinks import JsonlSink
+from shopee_core.processor import ShopeeDataProcessor
+from shopee_core.product_store import ProductStore
+
+from conftest import make_item
+
+
+def test_ids_are_stable_across_reopen(tmp_path):
+    path = str(tmp_path / 'images')
+    index = ImageIndex(path)
+    assert index.encode(['a', 'b', '', None, 'a']).tolist() == [0, 1, 0]
+    index.flush()
+
+    reopened = ImageIndex(path)
+    assert len(reopened) == 2
+    assert reopened.encode(['b', 'c']).tolist() == [1, 2]
+    assert reopened.decode([2, 0]) == ['c', 'a']
+
+
+def test_unflushed_ids_are_not_persisted(tmp_path):
+    path = str(tmp_path / 'images')
+    index = ImageIndex(path)
+    index.encode(['a'])
+    index.flush()
+    index.encode(['b'])
+
+    assert len(ImageIndex(path)) == 1
+
+
+def test_truncated_trailing_line_is_dropped(tmp_path):
+    path = tmp_path / 'images'
+    path.write_text("aa\nbb\ncc", encoding='utf-8')
+
+    index = ImageIndex(str(path))
+    assert index.decode([0, 1]) == ['aa', 'bb']
+    assert len(index) == 2
+    assert path.read_text(encoding='utf-8') == "aa\nbb\n"
+
+    assert index.intern('cc') == 2
+    index.flush()
+    assert ImageIndex(str(path)).decode([2]) == ['cc']
+
+
+def test_store_flushes_index_before_commit(tmp_path):
+    db_path = str(tmp_path / 'products.db')
+    index = ImageIndex.for_store(db_path)
+    store = ProductStore(db_path, image_index=index)
+    committed_at_flush = []
+
+    flush = index.flush
+
+    def checked_flush():
+        conn = sqlite3.connect(db_path)
+        committed_at_flush.append(conn.execute("SELECT COUNT(*) FROM products").fetchone()[0])
+        conn.close()
+        flush()
+
+    index.flush = checked_flush
+    store.write({'product_id': 1, 'shop_id': 2, 'images': ['x1', 'x2']})
+    store.close()
+
+    assert committed_at_flush == [0]
+    stored = ProductStore(db_path).get(2, 1)
+    assert 'images' not in stored
+    assert ImageIndex.for_store(db_path).decode(stored['image_ids']) == ['x1', 'x2']
+
+
+def test_sink_flushes_processor_index(tmp_path):
+    index = ImageIndex(str(tmp_path / 'images'))
+    processor = ShopeeDataProcessor(image_index=index)
+    record = processor.process_api_body(json.dumps({'item': make_item()}))
+
+    with JsonlSink(str(tmp_path / 'out'), basename='products', image_index=index) as sink:
+        sink.write(record)
+        sink.flush()
+        # Already on disk while the sink is still open
+        assert ImageIndex(str(tmp_path / 'images')).decode(record['image_ids']) == ['aa11', 'bb22']
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from shopee_core.metrics import Histogram, Metrics, _NULL_TIMER
+
+
+def test_histogram_buckets_are_power_of_two_microseconds():
+    histogram = Histogram()
+    for seconds in (0.0, 1e-6, 3e-6, 100e-6, 1e-3):
+        histogram.observe(seconds)
+
+    assert histogram.buckets == {1: 2, 4: 1, 128: 1, 1024: 1}
+    assert histogram.count == 5
+    assert histogram.min == 0.0
+    assert histogram.max == 1e-3
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    assert histogram.percentile(0.5) == 0.0
+    for _ in range(9):
+        histogram.observe(100e-6)
+    histogram.observe(1e-3)
+
+    assert histogram.percentile(0.5) == pytest.approx(128e-6)
+    assert histogram.percentile(0.9) == pytest.approx(128e-6)
+    # Bucket bound 1024us is capped at the observed maximum
+    assert histogram.percentile(0.99) == pytest.approx(1e-3)
+
+    summary = histogram.summary()
+    assert summary['count'] == 10
+    assert summary['p50_ms'] == 0.128
+    assert summary['max_ms'] == 1.0
+    assert summary['mean_ms'] == pytest.approx(0.19)
+
+
+def test_disabled_registry_is_a_no_op(capsys):
+    registry = Metrics()
+
+    assert registry.timer('parse') is _NULL_TIMER
+    with registry.timer('parse'):
+        pass
+    registry.incr('capture.matched')
+    registry.observe('parse', 0.5)
+    registry.dump()
+
+    assert registry.counters == {}
+    assert registry.histograms == {}
+    assert capsys.readouterr().out == ""
+
+
+def test_enabled_registry_records_stages():
+    registry = Metrics()
+    registry.enable()
+
+    with registry.timer('parse'):
+        pass
+    registry.incr('capture.matched')
+    registry.incr('capture.matched', 2)
+
+    assert registry.counters == {'capture.matched': 3}
+    assert registry.histograms['parse'].count == 1
+
+
+def test_dump_appends_json_lines_to_a_file(tmp_path):
+    output = tmp_path / 'metrics.jsonl'
+    registry = Metrics()
+    registry.enable(str(output))
+    registry.incr('sink.records', 5)
+    registry.observe('sink_flush', 0.002)
+
+    registry.dump()
+    registry.dump()
+
+    lines = output.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 2
+    snapshot = json.loads(lines[0])
+    assert set(snapshot) == {'timestamp', 'elapsed_s', 'counters', 'stages'}
+    assert snapshot['counters'] == {'sink.records': 5}
+    assert snapshot['stages']['sink_flush']['count'] == 1
+    assert snapshot['stages']['sink_flush']['max_ms'] == 2.0
+
+
+def test_dump_to_stdout(capsys):
+    registry = Metrics()
+    registry.enable("stdout")
+    registry.incr('pipeline.errors')
+    registry.observe('parse', 0.001)
+
+    registry.dump()
+
+    out = capsys.readouterr().out.splitlines()
+    assert out[0] == "Pipeline metrics:"
+    assert out[1].split() == ['pipeline.errors', '1']
+    assert out[2].split()[:2] == ['parse', 'n=1']
@@ -0,0 +1,49 @@
+from mobile_emulation_template import NetworkTrafficCapture
+
+API_LINE = "10-17 12:00:00.000 I/chromium( 1234): https://shopee.tw/api/v4/pdp/get_pc?itemid={n} {{}}\n"
+LINES = [
+    "10-17 12:00:00.000 I/chromium( 1234): https://shopee.tw/search?keyword=x\n",
+    # Prefix matches but no product endpoint follows it
+    "10-17 12:00:00.000 I/chromium( 1234): https://shopee.tw/api/v4/account/basic/get\n",
+    "10-17 12:00:00.000 I/chromium( 1234): https://shopee.tw/api/v4/item/get?itemid=7 {}\n",
+    "10-17 12:00:00.000 I/chromium( 1234): https://shopee.tw/api/v4/product/get_shop_info?shopid=3\n",
+    "10-17 12:00:00.000 I/chromium( 1234): https://example.com/api/v4/pdp/get_pc\n",
+]
+
+
+def _capture(**kwargs) -> NetworkTrafficCapture:
+    capture = NetworkTrafficCapture(**kwargs)
+    capture.is_capturing = True
+    return capture
+
+
+def test_process_log_stream_queues_only_api_lines():
+    capture = _capture()
+
+    assert capture._process_log_stream(iter(LINES)) == len(LINES)
+
+    queued = [entry['log_line'] for entry in capture.get_captured_data()]
+    assert queued == [LINES[2].strip(), LINES[3].strip()]
+    assert capture.dropped_count == 0
+
+
+def test_process_log_stream_drops_when_queue_is_full(capsys):
+    capture = _capture(max_queued=3)
+    lines = [API_LINE.format(n=n) for n in range(5)]
+
+    capture._process_log_stream(iter(lines))
+
+    assert [entry['log_line'] for entry in capture.get_captured_data()] == [line.strip() for line in lines[:3]]
+    assert capture.dropped_count == 2
+
+    capture.stop_traffic_capture()
+    assert "dropped 2 captured API responses" in capsys.readouterr().out
+
+
+def test_process_log_stream_stops_with_capture():
+    capture = _capture()
+    lines = iter([API_LINE.format(n=1), API_LINE.format(n=2)])
+
+    capture.is_capturing = False
+    assert capture._process_log_stream(lines) == 0
+    assert capture.get_captured_data() == []
@@ -0,0 +1,55 @@
+import gzip
+import json
+import os
+import zlib
+
+from shopee_core.output_sinks import GzipJsonlSink, JsonlSink
+
+
+def _read_jsonl(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_rotation_finalizes_files(tmp_path):
+    with JsonlSink(str(tmp_path), basename='products', batch_size=2, records_per_file=3) as sink:
+        sink.write_many({'n': n} for n in range(7))
+
+    assert [os.path.basename(path) for path in sink.completed_files] == [
+        'products-00001.jsonl', 'products-00002.jsonl', 'products-00003.jsonl',
+    ]
+    rows = [row for path in sink.completed_files for row in _read_jsonl(path)]
+    assert rows == [{'n': n} for n in range(7)]
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.part')]
+
+
+def test_rerun_after_crash_keeps_partial_and_finished_files(tmp_path):
+    with JsonlSink(str(tmp_path), basename='products') as first:
+        first.write({'run': 0})
+
+    crashed = JsonlSink(str(tmp_path), basename='products', batch_size=1)
+    for n in range(4):
+        crashed.write({'run': 1, 'n': n})
+    # Simulate a crash: the part file is left open and never finalized
+    crashed._file.close()
+
+    with JsonlSink(str(tmp_path), basename='products') as rerun:
+        rerun.write({'run': 2})
+
+    assert _read_jsonl(str(tmp_path / 'products-00001.jsonl')) == [{'run': 0}]
+    assert len(_read_jsonl(str(tmp_path / 'products-00002.jsonl.part'))) == 4
+    assert rerun.completed_files == [str(tmp_path / 'products-00003.jsonl')]
+    assert _read_jsonl(rerun.completed_files[0]) == [{'run': 2}]
+
+
+def test_gzip_part_file_readable_after_crash(tmp_path):
+    crashed = GzipJsonlSink(str(tmp_path), basename='products', batch_size=2)
+    crashed.write_many({'n': n} for n in range(5))
+
+    # Two sync-flushed batches are on disk; the buffered fifth record is lost
+    with open(tmp_path / 'products-00001.jsonl.gz.part', 'rb') as f:
+        data = f.read()
+    decompressor = zlib.decompressobj(31)
+    lines = decompressor.decompress(data).decode('utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == [{'n': n} for n in range(4)]
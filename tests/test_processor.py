@@ -0,0 +1,114 @@
+import json
+
+import pytest
+
+from shopee_core.processor import ShopeeDataProcessor
+from shopee_core.projected_parser import DEFAULT_ITEM_FIELDS, parse_item_projection
+
+from conftest import make_item
+
+
+def _without_time(record):
+    return {key: value for key, value in record.items() if key != 'extracted_at'}
+
+
+def test_process_api_body_unwraps_data_envelope(pc_body):
+    record = ShopeeDataProcessor().process_api_body(pc_body)
+
+    assert record['product_id'] == 1001
+    assert record['shop_id'] == 77
+    assert record['rating'] == 4.5
+    assert record['images'] == ['aa11', 'bb22']
+
+
+@pytest.mark.parametrize('body_type', [str, bytes])
+def test_projected_matches_full_parse(pc_body, body_type):
+    body = pc_body if body_type is str else pc_body.encode('utf-8')
+    full = ShopeeDataProcessor().process_api_body(body)
+    projected = ShopeeDataProcessor(item_fields=DEFAULT_ITEM_FIELDS).process_api_body(body)
+
+    assert _without_time(projected) == _without_time(full)
+
+
+def test_projection_skips_nested_item_keys():
+    body = json.dumps({'data': {'ratings': [{'item': {'name': "x"}}], 'item': make_item(5)}})
+    assert parse_item_projection(body, ('itemid', 'name'))['itemid'] == 5
+
+
+@pytest.mark.parametrize('sections', [
+    {'recommendations': [{'item': make_item(999)}]},
+    {'shop_detailed': {'item': make_item(998)}, 'product_review': {'ratings': [{'item': make_item(997)}]}},
+])
+def test_projection_ignores_items_in_earlier_sections(sections):
+    body = json.dumps({'error': 0, 'data': dict(sections, item=make_item(5))})
+    full = ShopeeDataProcessor().process_api_body(body)
+    projected = ShopeeDataProcessor(item_fields=DEFAULT_ITEM_FIELDS).process_api_body(body)
+
+    assert full['product_id'] == projected['product_id'] == 5
+    line = "D/OkHttp: https://shopee.tw/api/v4/pdp/get_pc " + body
+    assert [record['product_id'] for record in ShopeeDataProcessor(
+        item_fields=DEFAULT_ITEM_FIELDS).iter_mobile_api_responses([line])] == [5]
+
+
+@pytest.mark.parametrize('body', [
+    '{"item": {"itemid": 1, "shopid": 2}, "data": {"other": 1}}',
+    '{"data": {"item": null}, "item": {"itemid": 1, "shopid": 2}}',
+    '{"data": {"recommendations": [{"item": {"itemid": 1, "shopid": 2}}]}}',
+])
+def test_projection_follows_full_parse_envelope_rules(body):
+    assert ShopeeDataProcessor().process_api_body(body) == {}
+    assert ShopeeDataProcessor(item_fields=DEFAULT_ITEM_FIELDS).process_api_body(body) == {}
+
+
+@pytest.mark.parametrize('item_fields', [None, DEFAULT_ITEM_FIELDS])
+def test_iter_responses_handles_pc_bodies(pc_body, item_fields):
+    processor = ShopeeDataProcessor(item_fields=item_fields)
+    line = "D/OkHttp: " + json.dumps({'item': make_item(2002)})
+
+    records = list(processor.iter_mobile_api_responses([pc_body, pc_body.encode('utf-8'), line]))
+
+    assert [record['product_id'] for record in records] == [1001, 1001, 2002]
+
+
+@pytest.mark.parametrize('item_fields', [None, DEFAULT_ITEM_FIELDS, ('name', 'price')])
+def test_documents_without_a_product_are_dropped(item_fields):
+    processor = ShopeeDataProcessor(item_fields=item_fields)
+    no_product = [
+        '{"error": 1}',
+        '{"error": 0, "data": null}',
+        '{"data": {"item": {"name": "no ids"}}}',
+        'not json at all',
+        '[1, 2, 3]',
+    ]
+
+    assert list(processor.iter_mobile_api_responses(no_product)) == []
+    for body in no_product:
+        assert processor.process_api_body(body) == {}
+
+
+def test_projection_keeps_key_fields():
+    body = json.dumps({'item': make_item(3003)})
+    record = ShopeeDataProcessor(item_fields=('name',)).process_api_body(body)
+
+    assert (record['product_id'], record['shop_id'], record['name']) == (3003, 77, "product 3003")
+    assert record['price'] is None
+
+
+def test_compact_records(pc_body):
+    record = ShopeeDataProcessor(compact_records=True, defer_description=True).process_api_body(pc_body)
+
+    assert record.product_id == 1001
+    assert record.to_dict()['description'] == "line one\nline \"two\""
+
+
+def test_mobile_response_respects_projection(monkeypatch):
+    line = "10-17 12:00:00.000 D/OkHttp: https://shopee.tw/api/v4/item/get " + json.dumps({'item': make_item(4004)})
+    full = ShopeeDataProcessor().process_mobile_api_response(line)
+
+    processor = ShopeeDataProcessor(item_fields=DEFAULT_ITEM_FIELDS, defer_description=True)
+    # The projected path must not fall back to decoding the whole document
+    monkeypatch.setattr(json, 'loads', None)
+    projected = processor.process_mobile_api_response(line)
+
+    assert projected['product_id'] == 4004
+    assert _without_time(projected) == dict(_without_time(full), description=None)
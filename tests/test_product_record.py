@@ -0,0 +1,43 @@
+import pytest
+
+from shopee_core.image_index import ImageIndex
+from shopee_core.product_record import FIELDS, ProductRecord
+from shopee_core.projected_parser import RawJSON
+
+from conftest import make_item
+
+HASHES = ['0123456789abcdef0123456789abcdef', 'fedcba9876543210fedcba9876543210']
+
+
+def test_round_trip_through_dict():
+    record = ProductRecord.from_item(make_item(description="x" * 1000, images=[{'image': h} for h in HASHES]),
+                                     extracted_at="2026-01-01T00:00:00")
+
+    exported = record.to_dict()
+    assert list(exported) == list(FIELDS)
+    assert exported['description'] == "x" * 1000
+    assert exported['images'] == HASHES
+    assert ProductRecord.from_dict(exported) == record
+    assert dict(record) == exported
+
+
+def test_deferred_description_decodes_on_access():
+    record = ProductRecord(product_id=1, description=RawJSON('"line \\"quoted\\""'))
+    assert record.description == 'line "quoted"'
+
+
+def test_index_backed_record_mapping_matches_to_dict(tmp_path):
+    index = ImageIndex(str(tmp_path / 'images'))
+    record = ProductRecord.from_item(make_item(images=[{'image': h} for h in HASHES]), image_index=index)
+
+    exported = record.to_dict()
+    assert dict(record) == exported
+    assert list(record.keys()) == list(exported)
+    assert len(record) == len(exported)
+    assert 'image_ids' in record and 'images' not in record
+    assert record['image_ids'] == [0, 1]
+    assert record.get('images') is None
+    with pytest.raises(KeyError):
+        record['images']
+    # The attribute still decodes through the index
+    assert record.images == HASHES
@@ -0,0 +1,67 @@
+import sqlite3
+
+from shopee_core.product_store import ProductStore
+
+
+def _record(price=1000, stock=5, sold=10, extracted_at="2026-01-01T00:00:00", **overrides):
+    record = {'product_id': 1, 'shop_id': 2, 'name': "product", 'price': price, 'stock': stock,
+              'sold_count': sold, 'extracted_at': extracted_at, 'source_url': "https://shopee.tw/x"}
+    record.update(overrides)
+    return record
+
+
+def test_upsert_skips_unchanged_and_logs_deltas(tmp_path):
+    with ProductStore(str(tmp_path / 'products.db')) as store:
+        assert store.upsert_many([_record()]) == (1, 0)
+        # Only capture time and URL differ: not a change
+        assert store.upsert_many([_record(extracted_at="2026-01-02T00:00:00", source_url="y")]) == (0, 1)
+        # A name edit replaces the snapshot without a change-log row
+        assert store.upsert_many([_record(name="renamed")]) == (1, 0)
+        assert store.upsert_many([_record(name="renamed", price=900, extracted_at="2026-01-03T00:00:00")]) == (1, 0)
+
+        assert store.get(2, 1)['price'] == 900
+        changes = list(store.iter_changes())
+
+    assert [(change['price'], change['price_delta'], change['stock_delta']) for change in changes] == [
+        (1000, None, None), (900, -100, 0),
+    ]
+    assert changes[1]['observed_at'] == "2026-01-03T00:00:00"
+    assert store.changes_appended == 2
+
+
+def test_duplicates_in_one_batch_compare_against_each_other(tmp_path):
+    with ProductStore(str(tmp_path / 'products.db'), batch_size=10) as store:
+        store.write_many([_record(price=100), _record(price=100), _record(price=80), _record(price=80)])
+        store.flush()
+
+        assert (store.records_written, store.records_unchanged) == (2, 2)
+        assert [change['price_delta'] for change in store.iter_changes()] == [None, -20]
+        assert store.get(2, 1)['price'] == 80
+
+
+def test_records_without_ids_are_ignored(tmp_path):
+    with ProductStore(str(tmp_path / 'products.db')) as store:
+        assert store.upsert_many([_record(product_id=None), {}]) == (0, 0)
+        assert list(store.iter_changes()) == []
+
+
+def test_update_seq_migration(tmp_path):
+    db_path = str(tmp_path / 'products.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE products (shop_id INTEGER NOT NULL, product_id INTEGER NOT NULL, "
+        "content_hash TEXT NOT NULL, record TEXT NOT NULL, first_seen TEXT NOT NULL, "
+        "last_seen TEXT NOT NULL, PRIMARY KEY (shop_id, product_id))"
+    )
+    conn.execute("INSERT INTO products VALUES (2, 9, 'old', '{}', 'then', 'then')")
+    conn.commit()
+    conn.close()
+
+    with ProductStore(db_path) as store:
+        store.upsert_many([_record()])
+        store.upsert_many([_record(product_id=3)])
+
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT product_id, update_seq FROM products ORDER BY product_id").fetchall()
+    conn.close()
+    assert rows == [(1, 1), (3, 2), (9, 0)]
@@ -0,0 +1,58 @@
+import sqlite3
+
+import pytest
+
+from shopee_core.product_store import ProductStore
+from shopee_core.report import ProductReport, main, summary_rows
+
+
+def _record(product_id, shop_id, price, stock=5, sold=10, rating=4.2):
+    return {'product_id': product_id, 'shop_id': shop_id, 'price': price, 'stock': stock,
+            'sold_count': sold, 'rating': rating, 'extracted_at': "2026-01-01T00:00:00"}
+
+
+def test_empty_store_gives_empty_columns(tmp_path):
+    db_path = str(tmp_path / 'products.db')
+    ProductStore(db_path).close()
+
+    report = ProductReport(db_path)
+    assert report.refresh() == 0
+    summary = report.shop_summary()
+
+    populated_path = str(tmp_path / 'populated.db')
+    with ProductStore(populated_path) as store:
+        store.write(_record(1, 10, 100))
+    populated = ProductReport(populated_path)
+    populated.refresh()
+    assert list(summary) == list(populated.shop_summary())
+    assert all(len(values) == 0 for values in summary.values())
+    assert summary_rows(summary) == []
+
+
+def test_shop_summary_and_incremental_refresh(tmp_path):
+    db_path = str(tmp_path / 'products.db')
+    with ProductStore(db_path) as store:
+        store.write_many([_record(1, 10, 100), _record(2, 10, 300, stock=0), _record(3, 20, None, rating=None)])
+
+    report = ProductReport(db_path)
+    assert report.refresh() == 3
+    rows = summary_rows(report.shop_summary())
+    assert [(row['shop_id'], row['products'], row['price_min'], row['price_max'], row['stock_out'])
+            for row in rows] == [(10, 2, 100, 300, 1), (20, 1, None, None, 0)]
+    assert rows[1]['unrated'] == 1
+
+    with ProductStore(db_path) as store:
+        store.write(_record(1, 10, 50))
+    assert report.refresh() == 1
+    assert len(report) == 3
+    assert summary_rows(report.shop_summary())[0]['price_min'] == 50
+
+
+def test_missing_store_is_not_created(tmp_path, capsys):
+    db_path = tmp_path / 'nonexist.db'
+
+    with pytest.raises(sqlite3.OperationalError):
+        ProductReport(str(db_path)).refresh()
+    assert main([str(db_path)]) == 1
+    assert "Error reading product store" in capsys.readouterr().err
+    assert not db_path.exists()
@@ -0,0 +1,83 @@
+import json
+import os
+
+from shopee_core.reprocess import plan_archive_shards, plan_logcat_shards, run_reprocess
+from shopee_core.response_archive import ResponseArchive
+
+from conftest import make_item, make_pc_body
+
+
+def _write_logcat(path, itemids):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("10-17 12:00:00.000 I/ActivityManager: unrelated\n")
+        for itemid in itemids:
+            body = json.dumps({'item': make_item(itemid)})
+            f.write(f"10-17 12:00:01.000 D/OkHttp: https://shopee.tw/api/v4/item/get {body}\n")
+    return str(path)
+
+
+def _merged_product_ids(output_dir):
+    ids = []
+    for name in sorted(os.listdir(output_dir)):
+        if name.endswith('.jsonl'):
+            with open(os.path.join(output_dir, name), 'r', encoding='utf-8') as f:
+                ids.extend(json.loads(line)['product_id'] for line in f)
+    return ids
+
+
+def test_logcat_rerun_with_another_file_is_not_resumed(tmp_path):
+    work_dir = str(tmp_path / 'work')
+    first = _write_logcat(tmp_path / 'l1.log', [1, 2, 3])
+    second = _write_logcat(tmp_path / 'l2.log', [4, 5])
+
+    run_reprocess(plan_logcat_shards([first]), str(tmp_path / 'out1'), work_dir, workers=1)
+    run_reprocess(plan_logcat_shards([second]), str(tmp_path / 'out2'), work_dir, workers=1)
+
+    assert _merged_product_ids(str(tmp_path / 'out1')) == [1, 2, 3]
+    assert _merged_product_ids(str(tmp_path / 'out2')) == [4, 5]
+
+
+def test_archive_rerun_resumes_only_matching_shards(tmp_path, capsys):
+    archive_root = str(tmp_path / 'archive')
+    archive = ResponseArchive(archive_root)
+    for itemid in range(1, 5):
+        archive.put(make_pc_body(itemid=itemid), f"https://shopee.tw/api/v4/pdp/get_pc?item={itemid}",
+                    f"2026-01-01T00:00:0{itemid}")
+    work_dir = str(tmp_path / 'work')
+
+    shards = plan_archive_shards(archive_root, 2, "get_pc")
+    run_reprocess(shards, str(tmp_path / 'out1'), work_dir, workers=1)
+    capsys.readouterr()
+
+    run_reprocess(plan_archive_shards(archive_root, 2, "get_pc"), str(tmp_path / 'out2'), work_dir, workers=1)
+    assert "Resuming: 2/2" in capsys.readouterr().out
+    assert _merged_product_ids(str(tmp_path / 'out2')) == [1, 2, 3, 4]
+
+    # Same shard size under another filter selects different entries
+    run_reprocess(plan_archive_shards(archive_root, 2, "item=3"), str(tmp_path / 'out3'), work_dir, workers=1)
+    assert "Resuming" not in capsys.readouterr().out
+    assert _merged_product_ids(str(tmp_path / 'out3')) == [3]
+
+
+def test_rerun_into_same_output_replaces_previous_merge(tmp_path):
+    archive_root = str(tmp_path / 'archive')
+    archive = ResponseArchive(archive_root)
+    for itemid in range(1, 4):
+        archive.put(make_pc_body(itemid=itemid), f"https://shopee.tw/api/v4/pdp/get_pc?item={itemid}")
+    output_dir = str(tmp_path / 'out')
+
+    def run():
+        run_reprocess(plan_archive_shards(archive_root, 2, "get_pc"), output_dir,
+                      os.path.join(output_dir, '.shards'), workers=1)
+
+    run()
+    run()
+    assert _merged_product_ids(output_dir) == [1, 2, 3]
+
+    # A crash mid-run leaves an unfinished shard and stray merge output behind
+    os.remove(os.path.join(output_dir, '.shards', 'shard-00001.done'))
+    for name in ('products-00007.jsonl', 'products-00008.jsonl.part'):
+        (tmp_path / 'out' / name).write_text('{"product_id": 0}\n', encoding='utf-8')
+    run()
+    assert _merged_product_ids(output_dir) == [1, 2, 3]
+    assert sorted(name for name in os.listdir(output_dir) if not name.startswith('.')) == ['products-00001.jsonl']
@@ -0,0 +1,18 @@
+from response_pipeline import ResponsePipeline
+
+
+def test_close_drains_queue_and_counts_errors():
+    handled = []
+
+    def handler(job):
+        if job % 5 == 0:
+            raise ValueError(f"bad job {job}")
+        handled.append(job)
+
+    with ResponsePipeline(handler, workers=3, max_pending=4) as pipeline:
+        for job in range(1, 21):
+            pipeline.submit(job)
+
+    assert sorted(handled) == [job for job in range(1, 21) if job % 5]
+    assert pipeline.processed_count == 16
+    assert pipeline.error_count == 4
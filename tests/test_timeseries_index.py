@@ -0,0 +1,68 @@
+import numpy as np
+
+from shopee_core.timeseries_index import MISSING, TimeSeriesIndex
+
+
+def _point(shop_id, product_id, ts, price):
+    return {'shop_id': shop_id, 'product_id': product_id, 'extracted_at': float(ts), 'price': price}
+
+
+def test_history_merges_index_and_unsorted_tail(tmp_path):
+    root = str(tmp_path / 'ts')
+    with TimeSeriesIndex(root, min_tail_rows=0) as index:
+        index.write_many(_point(1, product, ts, ts * 10) for ts in (30, 10, 20) for product in (7, 8))
+    # The first query builds the persisted index
+    assert index.history(1, 7)['price'].tolist() == [100, 200, 300]
+
+    tail = TimeSeriesIndex(root, min_tail_rows=100)
+    tail.write_many([_point(1, 7, 15, 150), _point(1, 7, 40, 400), _point(2, 9, 5, 50)])
+    assert tail.history(1, 7)['price'].tolist() == [100, 150, 200, 300, 400]
+    assert tail.history(1, 7, start=15, end=40)['ts'].tolist() == [15, 20, 30]
+    assert tail.history(2, 9)['price'].tolist() == [50]
+    assert len(tail.history(3, 3)) == 0
+    assert tail.items() == [(1, 7), (1, 8), (2, 9)]
+
+    # Reopening reads the persisted index plus the same tail
+    assert TimeSeriesIndex(root, min_tail_rows=100).history(1, 7)['price'].tolist() == [100, 150, 200, 300, 400]
+
+
+def test_large_tail_is_merged_into_the_index(tmp_path):
+    root = str(tmp_path / 'ts')
+    index = TimeSeriesIndex(root, tail_ratio=0.5, min_tail_rows=2)
+    index.write_many(_point(1, 1, ts, ts) for ts in range(4))
+    assert len(index.history(1, 1)) == 4
+    assert index._persisted_rows() == 4
+
+    index.write(_point(1, 1, 10, 10))
+    assert len(index.history(1, 1)) == 5
+    assert index._persisted_rows() == 4
+
+    index.write_many(_point(1, 2, ts, ts) for ts in range(3))
+    assert len(index.history(1, 2)) == 3
+    assert index._persisted_rows() == 8
+
+
+def test_aggregate_ignores_missing_values(tmp_path):
+    with TimeSeriesIndex(str(tmp_path / 'ts')) as index:
+        index.write_many([_point(1, 1, 1, 100), _point(1, 1, 2, None), _point(1, 1, 3, 300)])
+
+    stats = index.aggregate(1, 1)
+    assert (stats['count'], stats['min'], stats['max'], stats['last']) == (2, 100, 300, 300)
+    assert np.count_nonzero(index.history(1, 1)['price'] == MISSING) == 1
+
+
+def test_index_files_newer_than_metadata_are_not_double_counted(tmp_path):
+    root = tmp_path / 'ts'
+    index = TimeSeriesIndex(str(root), min_tail_rows=0)
+    index.write_many(_point(1, 1, ts, ts) for ts in range(1, 4))
+    assert len(index.history(1, 1)) == 3
+    metadata = (root / 'index.json').read_text(encoding='utf-8')
+
+    index.write_many(_point(1, 1, ts, ts) for ts in range(4, 6))
+    assert len(index.history(1, 1)) == 5
+
+    # Crash after the arrays were replaced but before index.json was
+    (root / 'index.json').write_text(metadata, encoding='utf-8')
+    reopened = TimeSeriesIndex(str(root), min_tail_rows=100)
+    assert reopened.history(1, 1)['ts'].tolist() == [1, 2, 3, 4, 5]
+    assert reopened._persisted_rows() == 0